@@ -24,6 +24,8 @@ if config.config_file_name is not None:
 from app.db.database import Base
 from app.models.user import User, UserRole
 from app.models.construct import Construct
+from app.models.checkpoint import GraphCheckpoint, GraphCheckpointWrite
+from app.models.conversation_summary import ConversationSummary
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -0,0 +1,65 @@
+"""add_jsonb_merge_patch_function
+
+Revision ID: 8e3f0a6c2b71
+Revises: d5a8c3f1e290
+Create Date: 2026-10-17 22:05:12.480915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f0a6c2b71'
+down_revision: Union[str, None] = 'd5a8c3f1e290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # RFC 7396 merge patch: objects merge recursively, null removes a key,
+    # anything else replaces the target value
+    op.execute("""
+    CREATE OR REPLACE FUNCTION public.jsonb_merge_patch(target jsonb, patch jsonb)
+    RETURNS jsonb
+    LANGUAGE plpgsql
+    IMMUTABLE
+    AS $$
+    DECLARE
+        result jsonb;
+        item record;
+    BEGIN
+        IF jsonb_typeof(patch) IS DISTINCT FROM 'object' THEN
+            RETURN patch;
+        END IF;
+
+        IF jsonb_typeof(target) IS DISTINCT FROM 'object' THEN
+            result := '{}'::jsonb;
+        ELSE
+            result := target;
+        END IF;
+
+        FOR item IN SELECT key, value FROM jsonb_each(patch) LOOP
+            IF item.value = 'null'::jsonb THEN
+                result := result - item.key;
+            ELSE
+                result := jsonb_set(
+                    result,
+                    ARRAY[item.key],
+                    public.jsonb_merge_patch(result -> item.key, item.value)
+                );
+            END IF;
+        END LOOP;
+
+        RETURN result;
+    END;
+    $$;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS public.jsonb_merge_patch(jsonb, jsonb);")
@@ -0,0 +1,28 @@
+"""add_constructs_creator_created_index
+
+Revision ID: b41e7d2a9c53
+Revises: 6c1d2b9e4f7a
+Create Date: 2026-10-17 21:31:47.662015
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e7d2a9c53'
+down_revision: Union[str, None] = '6c1d2b9e4f7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_constructs_creator_created', 'constructs', ['creator_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_constructs_creator_created', table_name='constructs')
@@ -0,0 +1,85 @@
+"""add_jsonb_patch_operation_function
+
+Revision ID: c3e7a91d5f20
+Revises: 8e3f0a6c2b71
+Create Date: 2026-10-18 09:14:37.206518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a91d5f20'
+down_revision: Union[str, None] = '8e3f0a6c2b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One RFC 6902 add/remove/replace operation. Missing targets (or parents,
+    # for add) raise no_data_found instead of silently leaving data unchanged;
+    # add inserts into arrays and sets object members, whatever the key looks like
+    op.execute("""
+    CREATE OR REPLACE FUNCTION public.jsonb_patch_operation(
+        target jsonb, operation text, path text[], value jsonb
+    )
+    RETURNS jsonb
+    LANGUAGE plpgsql
+    IMMUTABLE
+    AS $$
+    DECLARE
+        depth integer := coalesce(array_length(path, 1), 0);
+        parent jsonb;
+        last_token text;
+        pointer text := '/' || array_to_string(path, '/');
+    BEGIN
+        IF depth = 0 THEN
+            RAISE EXCEPTION 'JSON Patch cannot % the whole document', operation
+                USING ERRCODE = 'invalid_parameter_value';
+        END IF;
+
+        parent := target #> path[1:depth - 1];
+        last_token := path[depth];
+        IF parent IS NULL THEN
+            RAISE EXCEPTION 'JSON Patch path not found: %', pointer USING ERRCODE = 'no_data_found';
+        END IF;
+
+        IF jsonb_typeof(parent) = 'array' THEN
+            IF operation = 'add' AND last_token = '-' THEN
+                RETURN jsonb_insert(target, path[1:depth - 1] || '-1'::text, value, true);
+            END IF;
+            -- Array indexes are non-negative integers; add may also target the end
+            IF last_token !~ '^(0|[1-9][0-9]{0,8})$'
+                OR last_token::integer > jsonb_array_length(parent) - (operation <> 'add')::integer THEN
+                RAISE EXCEPTION 'JSON Patch path not found: %', pointer USING ERRCODE = 'no_data_found';
+            END IF;
+            IF operation = 'add' THEN
+                RETURN jsonb_insert(target, path, value);
+            END IF;
+        ELSIF jsonb_typeof(parent) = 'object' THEN
+            IF operation = 'add' THEN
+                RETURN jsonb_set(target, path, value, true);
+            END IF;
+            IF NOT parent ? last_token THEN
+                RAISE EXCEPTION 'JSON Patch path not found: %', pointer USING ERRCODE = 'no_data_found';
+            END IF;
+        ELSE
+            RAISE EXCEPTION 'JSON Patch path not found: %', pointer USING ERRCODE = 'no_data_found';
+        END IF;
+
+        IF operation = 'remove' THEN
+            RETURN target #- path;
+        END IF;
+        RETURN jsonb_set(target, path, value, false);
+    END;
+    $$;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS public.jsonb_patch_operation(jsonb, text, text[], jsonb);")
@@ -0,0 +1,45 @@
+"""add_construct_search_indexes
+
+Revision ID: d5a8c3f1e290
+Revises: b41e7d2a9c53
+Create Date: 2026-10-17 21:40:05.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8c3f1e290'
+down_revision: Union[str, None] = 'b41e7d2a9c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('constructs', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+            "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{identity}', '{}'::jsonb), '[\"string\"]'::jsonb), 'B') || "
+            "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{archetype}', '{}'::jsonb), '[\"string\"]'::jsonb), 'B') || "
+            "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{psychographics}', '{}'::jsonb), '[\"string\"]'::jsonb), 'C') || "
+            "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{lifestyle}', '{}'::jsonb), '[\"string\"]'::jsonb), 'C')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('idx_constructs_data_gin', 'constructs', ['data'], unique=False, postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'})
+    op.create_index('idx_constructs_search_vector', 'constructs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_constructs_search_vector', table_name='constructs', postgresql_using='gin')
+    op.drop_index('idx_constructs_data_gin', table_name='constructs', postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'})
+    op.drop_column('constructs', 'search_vector')
@@ -0,0 +1,54 @@
+"""add_graph_checkpoints
+
+Revision ID: ee48ea763510
+Revises: 3fb9adb1ed3a
+Create Date: 2026-10-17 09:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee48ea763510'
+down_revision: Union[str, None] = '3fb9adb1ed3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('checkpoints',
+    sa.Column('thread_id', sa.String(), nullable=False),
+    sa.Column('checkpoint_ns', sa.String(), nullable=False),
+    sa.Column('checkpoint_id', sa.String(), nullable=False),
+    sa.Column('parent_checkpoint_id', sa.String(), nullable=True),
+    sa.Column('checkpoint_type', sa.String(), nullable=False),
+    sa.Column('checkpoint_blob', sa.LargeBinary(), nullable=False),
+    sa.Column('metadata_type', sa.String(), nullable=False),
+    sa.Column('metadata_blob', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id')
+    )
+    op.create_table('checkpoint_writes',
+    sa.Column('thread_id', sa.String(), nullable=False),
+    sa.Column('checkpoint_ns', sa.String(), nullable=False),
+    sa.Column('checkpoint_id', sa.String(), nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('idx', sa.Integer(), nullable=False),
+    sa.Column('channel', sa.String(), nullable=False),
+    sa.Column('value_type', sa.String(), nullable=False),
+    sa.Column('value_blob', sa.LargeBinary(), nullable=False),
+    sa.Column('task_path', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx')
+    )
+    op.create_index('idx_checkpoint_writes_thread', 'checkpoint_writes', ['thread_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_checkpoint_writes_thread', table_name='checkpoint_writes')
+    op.drop_table('checkpoint_writes')
+    op.drop_table('checkpoints')
@@ -1,3 +1,4 @@
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings
 import logging
 import sys
@@ -7,6 +8,79 @@ class Settings(BaseSettings):
     ollama_url:   str = "http://localhost:11434"
     log_level: str = "INFO"
 
+    # Database engine and connection pool
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    db_statement_cache_size: int = 100
+
+    # Optional read replica for plain SELECTs; a client's reads stay on the primary
+    # for this long after it writes (via a cookie, so on every worker)
+    database_replica_url: Optional[str] = None
+    replica_read_your_writes_seconds: float = 5.0
+
+    # LLM client pooling
+    llm_client_cache_size: int = 32
+    ollama_max_connections: int = 20
+    ollama_max_keepalive_connections: int = 10
+
+    # LLM admission control: concurrent generations per model (overrides by model name),
+    # plus a bounded wait queue; requests over capacity get 429/503 with Retry-After
+    llm_max_concurrency: int = 4
+    llm_model_concurrency: Dict[str, int] = {}
+    llm_max_queue: int = 32
+    llm_queue_timeout_seconds: float = 30.0
+
+    # LLM scheduling: interactive chat is served first; background work (rolling and
+    # journal summaries) may hold at most this share of a model's slots (min 1)
+    # and waits longer. Users share slots by weight (user id -> weight, default 1).
+    llm_background_slot_share: float = 0.5
+    llm_background_queue_timeout_seconds: float = 120.0
+    llm_user_weights: Dict[str, float] = {}
+
+    # Chat checkpointer: "memory" (in-process) or "postgres" (shared engine)
+    checkpointer_backend: str = "memory"
+
+    # In-memory checkpointer bounds (None disables a limit)
+    checkpoint_max_threads: Optional[int] = 1000
+    checkpoint_max_bytes: Optional[int] = 256 * 1024 * 1024
+    checkpoint_idle_ttl_seconds: Optional[float] = 6 * 60 * 60
+    # SQLite file for evicted threads (absolute path recommended); None drops them
+    checkpoint_spill_path: Optional[str] = None
+
+    # Rolling summary of turns that overflow the context budget
+    rolling_summary_enabled: bool = True
+    rolling_summary_max_words: int = 250
+
+    # Map-reduce summarization of long conversations
+    summary_chunk_tokens: int = 3000
+
+    # Construct row and rendered system prompt caches
+    construct_cache_size: int = 1024
+    prompt_cache_size: int = 2048
+    construct_cache_ttl_seconds: Optional[float] = 300
+    relationship_graph_cache_size: int = 1024
+
+    # Token budget for linked constructs in the system prompt (0 disables)
+    relationship_context_max_tokens: int = 600
+
+    # Rows per server-side cursor fetch / upsert batch for NDJSON export and import
+    bulk_transfer_batch_size: int = 500
+
+    # Verified JWT claims cache; asymmetric tokens are checked against the JWKS URL when set
+    # (e.g. https://<project>.supabase.co/auth/v1/.well-known/jwks.json)
+    jwt_claims_cache_size: int = 4096
+    jwt_claims_cache_max_ttl_seconds: float = 3600
+    supabase_jwks_url: Optional[str] = None
+    jwks_cache_ttl_seconds: float = 600
+
+    # Cross-worker cache invalidation over Postgres LISTEN/NOTIFY
+    cache_invalidation_enabled: bool = True
+    cache_listener_check_interval_seconds: float = 5.0
+
 settings = Settings()
 
 def setup_logging():
@@ -1,7 +1,13 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import Text, any_, cast, func, literal, literal_column, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, JSONPATH, UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncResult
 from app.models.construct import Construct
+from app.models.user import User
+from app.services.cache_invalidation_service import notify_construct_changed
 from uuid import UUID
 from app.crud import construct as crud
 
@@ -31,6 +37,48 @@ async def get_construct_by_id(
         logger.error(f"Error retrieving construct by ID {construct_id}: {e}")
         return None
     
+async def get_construct_version(
+    db: AsyncSession,
+    construct_id: UUID
+):
+    """
+    Retrieve only the owner and version of a construct, without its data.
+    
+    Args:
+        db (AsyncSession): The database session.
+        construct_id (UUID): The ID of the construct.
+    
+    Returns:
+        Optional[RowMapping]: creator_id and updated_at if found, otherwise None.
+    """
+    result = await db.execute(
+        select(Construct.creator_id, Construct.updated_at).where(Construct.id == construct_id)
+    )
+    return result.mappings().one_or_none()
+
+async def get_constructs_by_ids(
+    db: AsyncSession,
+    construct_ids: Sequence[UUID]
+) -> list[Construct]:
+    """
+    Retrieve several constructs in one query.
+    
+    Args:
+        db (AsyncSession): The database session.
+        construct_ids (Sequence[UUID]): The IDs of the constructs to retrieve.
+    
+    Returns:
+        list[Construct]: The constructs found, in no particular order.
+    """
+    if not construct_ids:
+        return []
+    result = await db.execute(
+        select(Construct).where(
+            Construct.id == any_(literal(list(construct_ids), ARRAY(PG_UUID(as_uuid=True))))
+        )
+    )
+    return list(result.scalars().all())
+
 async def get_all_constructs(
     db: AsyncSession
 ) -> list[Construct]:
@@ -67,6 +115,8 @@ async def create_construct(
     """
     try:
         db.add(construct)
+        await db.flush()
+        await notify_construct_changed(db, construct.id)
         await db.commit()
         await db.refresh(construct)
         return construct
@@ -102,6 +152,7 @@ async def update_construct(
             if hasattr(construct, key):
                 setattr(construct, key, value)
         
+        await notify_construct_changed(db, construct_id, construct.creator_id)
         await db.commit()
         await db.refresh(construct)
         return construct
@@ -132,6 +183,7 @@ async def delete_construct(
             return False
         
         await db.delete(construct)
+        await notify_construct_changed(db, construct_id, construct.creator_id)
         await db.commit()
         return True
     except Exception as e:
@@ -158,4 +210,281 @@ async def get_constructs_by_creator(
         return result.scalars().all()
     except Exception as e:
         logger.error(f"Error retrieving constructs for creator {creator_id}: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+async def get_constructs_page(
+    db: AsyncSession,
+    creator_id: UUID,
+    limit: Optional[int],
+    after: Optional[Tuple[datetime, UUID]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Tuple[list, bool]:
+    """
+    Retrieve one page of a user's constructs ordered by (created_at, id).
+    
+    Uses keyset pagination, served by idx_constructs_creator_created, so the
+    cost is proportional to the page size rather than the offset.
+    
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): The ID of the creator.
+        limit (Optional[int]): Maximum number of constructs to return; None returns all.
+        after (Optional[Tuple[datetime, UUID]]): Sort key of the last row of the previous page.
+        fields (Optional[Sequence[str]]): Columns to load; id and created_at are always included.
+    
+    Returns:
+        Tuple[list, bool]: Rows (Construct objects, or column mappings when fields
+        is given) and whether more rows follow.
+    """
+    if fields:
+        names = dict.fromkeys(["id", "created_at", *fields])
+        stmt = select(*[getattr(Construct, name) for name in names])
+    else:
+        stmt = select(Construct)
+    
+    stmt = stmt.where(Construct.creator_id == creator_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(Construct.created_at, Construct.id) > tuple_(*after))
+    stmt = stmt.order_by(Construct.created_at, Construct.id)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    
+    result = await db.execute(stmt)
+    rows = result.mappings().all() if fields else result.scalars().all()
+    if limit is None:
+        return list(rows), False
+    return list(rows[:limit]), len(rows) > limit
+
+
+async def search_constructs(
+    db: AsyncSession,
+    creator_id: UUID,
+    limit: int,
+    query: Optional[str] = None,
+    contains: Optional[dict] = None,
+    path: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
+) -> list:
+    """
+    Search a user's constructs by full text and JSONB predicates.
+    
+    contains and path use idx_constructs_data_gin (jsonb_path_ops); query uses
+    the generated search_vector column and its GIN index, and ranks results.
+    
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): The ID of the creator.
+        limit (int): Maximum number of constructs to return.
+        query (Optional[str]): Full-text query in web search syntax.
+        contains (Optional[dict]): Document that data must contain (@>).
+        path (Optional[str]): SQL/JSON path predicate data must satisfy (@@).
+        fields (Optional[Sequence[str]]): Columns to load; id is always included.
+    
+    Returns:
+        list: Matching rows as column mappings, best match first when query is given.
+    """
+    names = dict.fromkeys(["id", *(fields or ["name", "data", "creator_id", "created_at", "updated_at"])])
+    stmt = select(*[getattr(Construct, name) for name in names]).where(
+        Construct.creator_id == creator_id
+    )
+    
+    if contains:
+        stmt = stmt.where(Construct.data.contains(contains))
+    if path:
+        stmt = stmt.where(Construct.data.op("@@")(cast(path, JSONPATH)))
+    if query:
+        ts_query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), query)
+        stmt = stmt.where(Construct.search_vector.op("@@")(ts_query)).order_by(
+            func.ts_rank(Construct.search_vector, ts_query).desc()
+        )
+    stmt = stmt.order_by(Construct.created_at, Construct.id).limit(limit)
+    
+    result = await db.execute(stmt)
+    return list(result.mappings().all())
+
+
+async def get_user_with_construct(
+    db: AsyncSession,
+    user_id: UUID,
+    construct_id: Optional[UUID]
+) -> Tuple[Optional[User], Optional[Construct]]:
+    """
+    Retrieve a user and a construct in a single query.
+    
+    The construct is outer-joined by ID only, so callers can tell a missing
+    construct from one owned by someone else.
+    
+    Args:
+        db (AsyncSession): The database session.
+        user_id (UUID): The ID of the user.
+        construct_id (Optional[UUID]): The ID of the construct, if any.
+    
+    Returns:
+        Tuple[Optional[User], Optional[Construct]]: The user (None if not found)
+        and the construct (None if not requested or not found).
+    """
+    if construct_id is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        return result.scalar_one_or_none(), None
+
+    result = await db.execute(
+        select(User, Construct)
+        .outerjoin(Construct, Construct.id == construct_id)
+        .where(User.id == user_id)
+    )
+    row = result.first()
+    if not row:
+        return None, None
+    return row[0], row[1]
+
+
+async def stream_constructs_by_creator(
+    db: AsyncSession,
+    creator_id: UUID,
+    yield_per: int = 500
+) -> AsyncResult:
+    """
+    Stream a user's constructs through a server-side cursor.
+    
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): The ID of the creator.
+        yield_per (int): Rows fetched per round trip.
+    
+    Returns:
+        AsyncResult: Row mappings of id, name, data, created_at and updated_at.
+    """
+    stmt = (
+        select(Construct.id, Construct.name, Construct.data, Construct.created_at, Construct.updated_at)
+        .where(Construct.creator_id == creator_id)
+        .order_by(Construct.created_at, Construct.id)
+        .execution_options(yield_per=yield_per)
+    )
+    result = await db.stream(stmt)
+    return result.mappings()
+
+
+async def upsert_constructs(
+    db: AsyncSession,
+    creator_id: UUID,
+    rows: list[dict]
+) -> int:
+    """
+    Insert or update constructs in one multi-row INSERT ... ON CONFLICT.
+    
+    Existing constructs are only updated when they belong to creator_id.
+    The caller commits.
+    
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): The owner of the imported constructs.
+        rows (list[dict]): Construct columns (id, name, data, created_at, updated_at).
+    
+    Returns:
+        int: Number of rows inserted or updated.
+    """
+    if not rows:
+        return 0
+    stmt = insert(Construct).values([{**row, "creator_id": creator_id} for row in rows])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Construct.id],
+        set_={
+            "name": stmt.excluded.name,
+            "data": stmt.excluded.data,
+            "updated_at": stmt.excluded.updated_at
+        },
+        where=Construct.creator_id == creator_id
+    ).returning(Construct.id)
+    result = await db.execute(stmt)
+    return len(result.all())
+
+
+# SQLSTATE (no_data_found) raised by jsonb_patch_operation for a missing patch path
+PATCH_PATH_NOT_FOUND = "P0002"
+
+
+def _json_pointer_tokens(pointer: str) -> list[str]:
+    """Split an RFC 6901 JSON pointer ("/a/b~1c") into path tokens (["a", "b/c"])."""
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]]
+
+
+def _apply_json_patch(expr, operations: Sequence[dict]):
+    """
+    Compose RFC 6902 add/remove/replace operations into one JSONB expression.
+    
+    Each operation wraps the previous expression, so they apply in order
+    within a single UPDATE. jsonb_patch_operation raises PATCH_PATH_NOT_FOUND
+    when an operation targets a missing path.
+    """
+    for operation in operations:
+        expr = func.jsonb_patch_operation(
+            expr,
+            operation["op"],
+            literal(_json_pointer_tokens(operation["path"]), ARRAY(Text)),
+            cast(literal(operation.get("value"), JSONB(none_as_null=False)), JSONB),
+            type_=JSONB
+        )
+    return expr
+
+
+async def patch_construct(
+    db: AsyncSession,
+    construct_id: UUID,
+    name: Optional[str] = None,
+    merge_patch: Optional[dict] = None,
+    operations: Optional[Sequence[dict]] = None,
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[Construct]:
+    """
+    Partially update a construct's data in place with a single UPDATE.
+    
+    The merge patch (RFC 7396) is applied first, then the JSON Patch
+    operations (RFC 6902, add/remove/replace) in order, all server-side.
+    
+    Args:
+        db (AsyncSession): The database session.
+        construct_id (UUID): The ID of the construct to patch.
+        name (Optional[str]): A new name, if any.
+        merge_patch (Optional[dict]): Merge patch applied to data.
+        operations (Optional[Sequence[dict]]): JSON Patch operations applied to data.
+        expected_updated_at (Optional[datetime]): Only patch if updated_at still equals this.
+    
+    Returns:
+        Optional[Construct]: The patched construct, or None if it does not exist
+        or was modified since expected_updated_at.
+    """
+    try:
+        data = func.coalesce(Construct.data, cast(literal("{}"), JSONB), type_=JSONB)
+        if merge_patch is not None:
+            data = func.jsonb_merge_patch(data, cast(literal(merge_patch, JSONB), JSONB), type_=JSONB)
+        if operations:
+            data = _apply_json_patch(data, operations)
+        
+        values = {"data": data, "updated_at": func.now()}
+        if name is not None:
+            values["name"] = name
+        
+        stmt = update(Construct).where(Construct.id == construct_id)
+        if expected_updated_at is not None:
+            stmt = stmt.where(Construct.updated_at == expected_updated_at)
+        stmt = (
+            stmt.values(**values)
+            .returning(Construct)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        
+        result = await db.execute(stmt)
+        construct = result.scalar_one_or_none()
+        if not construct:
+            await db.rollback()
+            return None
+        
+        await notify_construct_changed(db, construct_id, construct.creator_id)
+        await db.commit()
+        await db.refresh(construct)
+        return construct
+    except Exception as e:
+        logger.error(f"Error patching construct {construct_id}: {e}")
+        await db.rollback()
+        raise e
@@ -0,0 +1,380 @@
+from typing import Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+from sqlalchemy import and_, delete, or_, text
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.construct import Construct
+from app.models.construct_link import ConstructLink
+from app.models.construct_relationship_fragment import ConstructRelationshipFragment
+from uuid import UUID
+
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Walks links from the root up to :max_depth hops. Bidirectional links are
+# traversable both ways; only links between constructs owned by :user_id count.
+# Returns every such link among the reached constructs, with endpoint names and depths.
+# The walk recurses on (node, depth) with UNION rather than enumerating paths,
+# so it produces at most one row per construct per depth however dense the graph.
+NEIGHBORHOOD_QUERY = text("""
+WITH RECURSIVE edges AS (
+    SELECT l.source_id AS from_id, l.target_id AS to_id
+    FROM construct_links l
+    JOIN constructs s ON s.id = l.source_id AND s.creator_id = :user_id
+    JOIN constructs t ON t.id = l.target_id AND t.creator_id = :user_id
+    UNION ALL
+    SELECT l.target_id, l.source_id
+    FROM construct_links l
+    JOIN constructs s ON s.id = l.source_id AND s.creator_id = :user_id
+    JOIN constructs t ON t.id = l.target_id AND t.creator_id = :user_id
+    WHERE l.is_bidirectional
+),
+walk(node_id, depth) AS (
+    SELECT CAST(:root_id AS uuid), 0
+    UNION
+    SELECT e.to_id, w.depth + 1
+    FROM walk w
+    JOIN edges e ON e.from_id = w.node_id
+    WHERE w.depth < :max_depth
+),
+nodes AS (
+    SELECT node_id, min(depth) AS depth FROM walk GROUP BY node_id
+)
+SELECT l.id, l.source_id, l.target_id, l.link_type, l.label, l.notes, l.is_bidirectional,
+       s.name AS source_name, t.name AS target_name,
+       ns.depth AS source_depth, nt.depth AS target_depth
+FROM construct_links l
+JOIN nodes ns ON ns.node_id = l.source_id
+JOIN nodes nt ON nt.node_id = l.target_id
+JOIN constructs s ON s.id = l.source_id AND s.creator_id = :user_id
+JOIN constructs t ON t.id = l.target_id AND t.creator_id = :user_id
+ORDER BY least(ns.depth, nt.depth), l.created_at, l.id
+""")
+
+async def get_neighborhood_links(
+    db: AsyncSession,
+    user_id: UUID,
+    root_id: UUID,
+    max_depth: int
+) -> list[dict]:
+    """
+    Retrieve the links around a construct up to max_depth hops, in one query.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_id (UUID): Owner whose constructs may be traversed.
+        root_id (UUID): The construct to start from.
+        max_depth (int): Maximum number of hops from the root.
+
+    Returns:
+        list[dict]: Link rows with source/target names and their depth from the root.
+    """
+    result = await db.execute(
+        NEIGHBORHOOD_QUERY,
+        {"user_id": user_id, "root_id": root_id, "max_depth": max_depth}
+    )
+    return [dict(row) for row in result.mappings().all()]
+
+async def get_links_with_fragments(
+    db: AsyncSession,
+    construct_id: UUID
+) -> list[ConstructLink]:
+    """
+    Retrieve the links a construct knows about, with both ends and all fragments eagerly loaded.
+
+    Outgoing links and incoming bidirectional links are included. Endpoint names
+    are joined in and fragments are fetched with one selectin query, so no lazy
+    loads happen afterwards.
+
+    Args:
+        db (AsyncSession): The database session.
+        construct_id (UUID): The construct whose relationships to load.
+
+    Returns:
+        list[ConstructLink]: Links ordered by creation time.
+    """
+    stmt = (
+        select(ConstructLink)
+        .where(or_(
+            ConstructLink.source_id == construct_id,
+            and_(ConstructLink.target_id == construct_id, ConstructLink.is_bidirectional)
+        ))
+        .options(
+            joinedload(ConstructLink.source).load_only(Construct.id, Construct.name),
+            joinedload(ConstructLink.target).load_only(Construct.id, Construct.name),
+            selectinload(ConstructLink.fragments)
+        )
+        .order_by(ConstructLink.created_at)
+    )
+    result = await db.execute(stmt)
+    return list(result.scalars().unique().all())
+
+async def get_link_by_id(
+    db: AsyncSession,
+    link_id: UUID
+) -> Optional[ConstructLink]:
+    """
+    Retrieve a construct link by its ID.
+
+    Args:
+        db (AsyncSession): The database session.
+        link_id (UUID): The ID of the link to retrieve.
+
+    Returns:
+        Optional[ConstructLink]: The link if found, otherwise None.
+    """
+    try:
+        result = await db.execute(select(ConstructLink).where(ConstructLink.id == link_id))
+        return result.scalar_one_or_none()
+    except Exception as e:
+        logger.error(f"Error retrieving construct link {link_id}: {e}")
+        return None
+
+async def create_link(
+    db: AsyncSession,
+    link: ConstructLink
+) -> ConstructLink:
+    """
+    Create a new construct link in the database.
+
+    Args:
+        db (AsyncSession): The database session.
+        link (ConstructLink): The link to create.
+
+    Returns:
+        ConstructLink: The created link.
+    """
+    try:
+        db.add(link)
+        await db.commit()
+        await db.refresh(link)
+        return link
+    except Exception as e:
+        logger.error(f"Error creating construct link: {e}")
+        await db.rollback()
+        raise e
+
+async def delete_link(
+    db: AsyncSession,
+    link: ConstructLink
+) -> None:
+    """
+    Delete a construct link together with its relationship fragments.
+
+    Args:
+        db (AsyncSession): The database session.
+        link (ConstructLink): The link to delete.
+    """
+    try:
+        await db.execute(
+            delete(ConstructRelationshipFragment).where(
+                ConstructRelationshipFragment.construct_link_id == link.id
+            )
+        )
+        await db.delete(link)
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Error deleting construct link {link.id}: {e}")
+        await db.rollback()
+        raise e
+
+async def create_fragment(
+    db: AsyncSession,
+    fragment: ConstructRelationshipFragment
+) -> ConstructRelationshipFragment:
+    """
+    Create a new relationship fragment in the database.
+
+    Args:
+        db (AsyncSession): The database session.
+        fragment (ConstructRelationshipFragment): The fragment to create.
+
+    Returns:
+        ConstructRelationshipFragment: The created fragment.
+    """
+    try:
+        db.add(fragment)
+        await db.commit()
+        await db.refresh(fragment)
+        return fragment
+    except Exception as e:
+        logger.error(f"Error creating relationship fragment: {e}")
+        await db.rollback()
+        raise e
+
+async def get_fragments_for_links(
+    db: AsyncSession,
+    link_ids: Sequence[UUID],
+    context_tag: Optional[str] = None
+) -> list[ConstructRelationshipFragment]:
+    """
+    Retrieve the fragments of several links in one query.
+
+    Args:
+        db (AsyncSession): The database session.
+        link_ids (Sequence[UUID]): The links whose fragments to load.
+        context_tag (Optional[str]): Only return fragments with this tag.
+
+    Returns:
+        list[ConstructRelationshipFragment]: Fragments ordered by creation time.
+    """
+    if not link_ids:
+        return []
+    stmt = select(ConstructRelationshipFragment).where(
+        ConstructRelationshipFragment.construct_link_id.in_(link_ids)
+    )
+    if context_tag is not None:
+        stmt = stmt.where(ConstructRelationshipFragment.context_tag == context_tag)
+    result = await db.execute(stmt.order_by(ConstructRelationshipFragment.created_at))
+    return list(result.scalars().all())
+
+def _owned_construct_ids(creator_id: UUID):
+    return select(Construct.id).where(Construct.creator_id == creator_id)
+
+def _owned_link_ids(creator_id: UUID):
+    return select(ConstructLink.id).where(ConstructLink.source_id.in_(_owned_construct_ids(creator_id)))
+
+async def stream_links_by_creator(
+    db: AsyncSession,
+    creator_id: UUID,
+    yield_per: int = 500
+) -> AsyncResult:
+    """
+    Stream the links between a user's constructs through a server-side cursor.
+
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): Owner of the source constructs.
+        yield_per (int): Rows fetched per round trip.
+
+    Returns:
+        AsyncResult: Row mappings of the link columns.
+    """
+    stmt = (
+        select(
+            ConstructLink.id, ConstructLink.source_id, ConstructLink.target_id,
+            ConstructLink.link_type, ConstructLink.label, ConstructLink.notes,
+            ConstructLink.is_bidirectional, ConstructLink.created_at, ConstructLink.updated_at
+        )
+        .where(ConstructLink.source_id.in_(_owned_construct_ids(creator_id)))
+        .order_by(ConstructLink.created_at, ConstructLink.id)
+        .execution_options(yield_per=yield_per)
+    )
+    result = await db.stream(stmt)
+    return result.mappings()
+
+async def stream_fragments_by_creator(
+    db: AsyncSession,
+    creator_id: UUID,
+    yield_per: int = 500
+) -> AsyncResult:
+    """
+    Stream the fragments of a user's links through a server-side cursor.
+
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): Owner of the links' source constructs.
+        yield_per (int): Rows fetched per round trip.
+
+    Returns:
+        AsyncResult: Row mappings of the fragment columns.
+    """
+    stmt = (
+        select(
+            ConstructRelationshipFragment.id, ConstructRelationshipFragment.construct_link_id,
+            ConstructRelationshipFragment.context_tag, ConstructRelationshipFragment.data,
+            ConstructRelationshipFragment.created_at, ConstructRelationshipFragment.updated_at
+        )
+        .where(ConstructRelationshipFragment.construct_link_id.in_(_owned_link_ids(creator_id)))
+        .order_by(ConstructRelationshipFragment.created_at, ConstructRelationshipFragment.id)
+        .execution_options(yield_per=yield_per)
+    )
+    result = await db.stream(stmt)
+    return result.mappings()
+
+async def upsert_links(
+    db: AsyncSession,
+    creator_id: UUID,
+    rows: list[dict]
+) -> int:
+    """
+    Insert or update links in one multi-row INSERT ... ON CONFLICT.
+
+    Rows whose endpoints are not both owned by creator_id are dropped, and
+    existing links are only updated when their source belongs to creator_id.
+    The caller commits.
+
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): Owner of the linked constructs.
+        rows (list[dict]): Link columns.
+
+    Returns:
+        int: Number of rows inserted or updated.
+    """
+    endpoint_ids = {row["source_id"] for row in rows} | {row["target_id"] for row in rows}
+    if not endpoint_ids:
+        return 0
+    result = await db.execute(
+        _owned_construct_ids(creator_id).where(Construct.id.in_(endpoint_ids))
+    )
+    owned = set(result.scalars().all())
+    rows = [row for row in rows if row["source_id"] in owned and row["target_id"] in owned]
+    if not rows:
+        return 0
+
+    stmt = insert(ConstructLink).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ConstructLink.id],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("source_id", "target_id", "link_type", "label", "notes", "is_bidirectional", "updated_at")
+        },
+        where=ConstructLink.source_id.in_(_owned_construct_ids(creator_id))
+    ).returning(ConstructLink.id)
+    result = await db.execute(stmt)
+    return len(result.all())
+
+async def upsert_fragments(
+    db: AsyncSession,
+    creator_id: UUID,
+    rows: list[dict]
+) -> int:
+    """
+    Insert or update relationship fragments in one multi-row INSERT ... ON CONFLICT.
+
+    Rows whose link is not owned by creator_id are dropped. The caller commits.
+
+    Args:
+        db (AsyncSession): The database session.
+        creator_id (UUID): Owner of the fragments' links.
+        rows (list[dict]): Fragment columns.
+
+    Returns:
+        int: Number of rows inserted or updated.
+    """
+    link_ids = {row["construct_link_id"] for row in rows}
+    if not link_ids:
+        return 0
+    result = await db.execute(
+        _owned_link_ids(creator_id).where(ConstructLink.id.in_(link_ids))
+    )
+    owned = set(result.scalars().all())
+    rows = [row for row in rows if row["construct_link_id"] in owned]
+    if not rows:
+        return 0
+
+    stmt = insert(ConstructRelationshipFragment).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ConstructRelationshipFragment.id],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("construct_link_id", "context_tag", "data", "updated_at")
+        },
+        where=ConstructRelationshipFragment.construct_link_id.in_(_owned_link_ids(creator_id))
+    ).returning(ConstructRelationshipFragment.id)
+    result = await db.execute(stmt)
+    return len(result.all())
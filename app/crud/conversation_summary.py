@@ -0,0 +1,79 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import func
+from app.models.conversation_summary import ConversationSummary
+from uuid import UUID
+
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def get_conversation_summary(
+    db: AsyncSession,
+    user_id: UUID,
+    thread_id: str
+) -> Optional[ConversationSummary]:
+    """
+    Retrieve the stored summary checkpoint for a thread.
+    
+    Args:
+        db (AsyncSession): The database session.
+        user_id (UUID): The owner of the thread.
+        thread_id (str): The conversation thread ID.
+    
+    Returns:
+        Optional[ConversationSummary]: The summary checkpoint if found, otherwise None.
+    """
+    try:
+        result = await db.execute(
+            select(ConversationSummary).where(
+                ConversationSummary.user_id == user_id,
+                ConversationSummary.thread_id == thread_id
+            )
+        )
+        return result.scalar_one_or_none()
+    except Exception as e:
+        logger.error(f"Error retrieving summary for thread {thread_id}: {e}")
+        return None
+
+async def upsert_conversation_summary(
+    db: AsyncSession,
+    user_id: UUID,
+    thread_id: str,
+    message_count: int,
+    prefix_hash: str,
+    notes: str
+) -> None:
+    """
+    Create or advance the summary checkpoint for a thread.
+    
+    Args:
+        db (AsyncSession): The database session.
+        user_id (UUID): The owner of the thread.
+        thread_id (str): The conversation thread ID.
+        message_count (int): Number of messages covered by the notes (the watermark).
+        prefix_hash (str): Hash of the covered messages.
+        notes (str): Summary notes for the covered messages.
+    """
+    values = {
+        "message_count": message_count,
+        "prefix_hash": prefix_hash,
+        "notes": notes,
+    }
+    try:
+        stmt = insert(ConversationSummary).values(
+            user_id=user_id, thread_id=thread_id, **values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ConversationSummary.user_id, ConversationSummary.thread_id],
+            set_={**values, "updated_at": func.now()}
+        )
+        await db.execute(stmt)
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Error saving summary for thread {thread_id}: {e}")
+        await db.rollback()
+        raise e
@@ -1,8 +1,8 @@
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import config
+from app.db.instrumentation import InstrumentedAsyncAdaptedQueuePool, instrument_engine
+from app.db.routing import RoutingSession
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,8 +10,39 @@ load_dotenv()
 
 DATABASE_URL = config.settings.database_url
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+def _create_engine(url: str):
+    """Create an instrumented engine with the configured pool settings."""
+    engine = create_async_engine(
+        url,
+        echo=config.settings.db_echo,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=config.settings.db_pool_size,
+        max_overflow=config.settings.db_max_overflow,
+        pool_timeout=config.settings.db_pool_timeout_seconds,
+        pool_pre_ping=config.settings.db_pool_pre_ping,
+        pool_recycle=config.settings.db_pool_recycle_seconds,
+        connect_args={
+            # SQLAlchemy's per-connection prepared statement cache and asyncpg's own
+            # statement cache; set to 0 behind transaction-pooling PgBouncer
+            "prepared_statement_cache_size": config.settings.db_statement_cache_size,
+            "statement_cache_size": config.settings.db_statement_cache_size
+        }
+    )
+    instrument_engine(engine)
+    return engine
+
+engine = _create_engine(DATABASE_URL)
+
+# Optional read replica; plain SELECTs are routed to it by RoutingSession
+replica_engine = (
+    _create_engine(config.settings.database_replica_url)
+    if config.settings.database_replica_url else None
+)
+if replica_engine is not None:
+    RoutingSession.replica_bind = replica_engine.sync_engine
+
 AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, autoflush=False, autocommit=False
+    engine, class_=AsyncSession, sync_session_class=RoutingSession,
+    autoflush=False, autocommit=False
 )
 Base = declarative_base()
@@ -0,0 +1,80 @@
+"""
+Database engine instrumentation.
+Records how long requests wait to check a connection out of the pool and how
+long each statement takes, so pool saturation shows up before latency does.
+"""
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.utils.metrics_utils import Histogram
+
+# Stack of statement start times in Connection.info (cursor executes can nest)
+QUERY_START_KEY = "query_start_times"
+
+
+class DatabaseMetrics:
+    """Pool checkout-wait and query-latency histograms for one engine."""
+
+    def __init__(self):
+        self.pool_wait = Histogram()
+        self.query_latency = Histogram()
+        self.query_errors = 0
+
+    def stats(self, engine: AsyncEngine) -> Dict[str, Any]:
+        """Histograms plus the current pool occupancy."""
+        pool = engine.sync_engine.pool
+        pool_state = {"status": pool.status()}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            pool_state.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "idle": pool.checkedin()
+            })
+        return {
+            "pool": pool_state,
+            "pool_wait_seconds": self.pool_wait.stats(),
+            "query_latency_seconds": self.query_latency.stats(),
+            "query_errors": self.query_errors
+        }
+
+
+db_metrics = DatabaseMetrics()
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout, including the wait for a free connection."""
+
+    def _do_get(self):
+        # PoolEvents has no "checkout requested" hook, so time the pool's own getter
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_metrics.pool_wait.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Register statement latency hooks on an engine."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(QUERY_START_KEY)
+        if starts:
+            db_metrics.query_latency.observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        db_metrics.query_errors += 1
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(QUERY_START_KEY):
+            conn.info[QUERY_START_KEY].pop()
@@ -0,0 +1,94 @@
+"""
+Read-replica routing.
+When a replica is configured, sessions send plain SELECTs to it and everything
+else to the primary. Reads stick to the primary once the session has written,
+and for a short window after any write by the same client, so users always see
+their own changes despite replication lag.
+
+The window is carried by a cookie (set by ReadYourWritesMiddleware on responses
+to requests that wrote), so it holds on whichever worker serves the next
+request. Writers are also remembered per user in this worker, which covers
+clients that do not keep cookies, but only while they stay on the same worker.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config.config import settings
+from app.utils.cache_utils import LRUCache
+
+# Session.info flag: this session has written (or was pinned) and reads from the primary
+USE_PRIMARY_KEY = "use_primary"
+
+# Cookie holding the Unix time until which the client reads from the primary
+READ_YOUR_WRITES_COOKIE = "primary_until"
+
+# User of the current request, bound by the auth dependency
+request_user_id: ContextVar[Optional[UUID]] = ContextVar("request_user_id", default=None)
+
+
+class RequestRouting:
+    """Read-your-writes state of one HTTP request."""
+
+    def __init__(self, primary_until: float = 0.0):
+        # From the client's cookie: reads go to the primary until this time
+        self.primary_until = primary_until
+        # Set when the request writes, so the response renews the cookie
+        self.wrote = False
+
+
+# Routing state of the current request, bound by ReadYourWritesMiddleware
+request_routing: ContextVar[Optional[RequestRouting]] = ContextVar("request_routing", default=None)
+
+# Users who wrote within the read-your-writes window (process-local)
+_recent_writers = LRUCache(maxsize=10000, ttl=settings.replica_read_your_writes_seconds)
+
+
+def bind_request_user(user_id: UUID) -> None:
+    """Associate the current request with a user for read-your-writes routing."""
+    request_user_id.set(user_id)
+
+
+def use_primary(session: Any) -> None:
+    """Pin a session (sync or async) to the primary for the rest of its life."""
+    getattr(session, "sync_session", session).info[USE_PRIMARY_KEY] = True
+
+
+class RoutingSession(Session):
+    """Session that serves plain SELECTs from the replica when it is safe to."""
+
+    # Set by app.db.database when a replica URL is configured
+    replica_bind: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if self.replica_bind is not None and self._can_read_replica(clause):
+            return self.replica_bind
+
+        if self._flushing or getattr(clause, "is_dml", False):
+            self._record_write()
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _can_read_replica(self, clause) -> bool:
+        if self._flushing or self.info.get(USE_PRIMARY_KEY):
+            return False
+        # Text statements may write (e.g. pg_notify), and locking reads need the primary
+        if not getattr(clause, "is_select", False) or getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        routing = request_routing.get()
+        if routing is not None and routing.primary_until > time.time():
+            return False
+        user_id = request_user_id.get()
+        return user_id is None or _recent_writers.get(user_id) is None
+
+    def _record_write(self) -> None:
+        self.info[USE_PRIMARY_KEY] = True
+        routing = request_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        user_id = request_user_id.get()
+        if user_id is not None:
+            _recent_writers.set(user_id, True)
@@ -3,8 +3,27 @@ from app.db.database import AsyncSessionLocal
 from typing import AsyncGenerator
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request-scoped session.
+    
+    Creating the session does not touch the pool: a connection is checked out
+    when the first query runs and held until the transaction ends. Handlers
+    that go on to wait on something slow (an LLM call) should hand it back
+    with release_connection first.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Return the session's pooled connection without waiting for the request to end.
+    
+    Loaded objects are detached with their current values rather than expired,
+    so they stay readable. Uncommitted changes are discarded. The session
+    checks out a fresh connection if it is queried again.
+    """
+    if session.in_transaction():
+        await session.close()
@@ -1,6 +1,10 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from .routers import chat, construct
-from .config.config import setup_logging
+from .routers import chat, construct, construct_link, metrics
+from .config.config import settings, setup_logging
+from .services.cache_invalidation_service import cache_invalidation_listener
+from .middleware.read_your_writes import ReadYourWritesMiddleware
 
 
 # Load environment variables
@@ -13,10 +17,28 @@ except ImportError:
 # Setup logging
 setup_logging()
 
-app = FastAPI(title="AnimaOS", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.cache_invalidation_enabled:
+        cache_invalidation_listener.start()
+    yield
+    await cache_invalidation_listener.stop()
+
+
+app = FastAPI(title="AnimaOS", version="0.1.0", lifespan=lifespan)
+
+if settings.database_replica_url:
+    # Keeps a client's reads on the primary after it writes, across workers
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=settings.replica_read_your_writes_seconds
+    )
 
 app.include_router(chat.router, tags=["chat"])
 app.include_router(construct.router, tags=["constructs"])
+app.include_router(construct_link.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,39 +1,39 @@
 from fastapi import Depends, HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError, ExpiredSignatureError
-from decouple import config
+from jose import JWTError, ExpiredSignatureError
 from uuid import UUID
+import logging
 
+from app.db.routing import bind_request_user
+from app.services.token_verification_service import token_verification_service
 
-SUPABASE_JWT_SECRET = config('SUPABASE_JWT_SECRET')
-JWT_ALGORITHM = config('JWT_ALGORITHM')
+logger = logging.getLogger(__name__)
 
 auth_scheme = HTTPBearer()
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Security(auth_scheme)):
+async def verify_token(credentials: HTTPAuthorizationCredentials = Security(auth_scheme)):
     token = credentials.credentials
-    print(f"Verifying token: {token}")
     try:
-        payload = jwt.decode(token, SUPABASE_JWT_SECRET,
-                             algorithms=[JWT_ALGORITHM], audience='authenticated')
-        return payload
+        return await token_verification_service.verify(token)
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except JWTError:
+    except JWTError as e:
+        logger.debug(f"Rejected token: {e}")
         raise HTTPException(status_code=403, detail="Invalid token")
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(auth_scheme)) -> UUID:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(auth_scheme)) -> UUID:
 
     token = credentials.credentials
-    print(f"Verifying token: {token}")
     try:
-        payload = jwt.decode(token, SUPABASE_JWT_SECRET,
-                             algorithms=[JWT_ALGORITHM], audience='authenticated')
+        payload = await token_verification_service.verify(token)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=403, detail="Invalid token")
-        return UUID(user_id)
-    except JWTError:
+        user_id = UUID(user_id)
+        bind_request_user(user_id)
+        return user_id
+    except JWTError as e:
+        logger.debug(f"Rejected token: {e}")
         raise HTTPException(status_code=403, detail="Invalid token")
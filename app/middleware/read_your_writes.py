@@ -0,0 +1,53 @@
+"""
+Read-your-writes middleware.
+Binds per-request replica routing state and, when a request wrote, sets a
+short-lived cookie that keeps the client's reads on the primary on every
+worker until the replica has caught up.
+"""
+import math
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.routing import READ_YOUR_WRITES_COOKIE, RequestRouting, request_routing
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client's reads to the primary for window_seconds after it writes."""
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        routing = RequestRouting(self._primary_until(scope))
+        token = request_routing.set(routing)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and routing.wrote:
+                until = time.time() + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            request_routing.reset(token)
+
+    def _primary_until(self, scope: Scope) -> float:
+        try:
+            until = float(HTTPConnection(scope).cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+        except ValueError:
+            return 0.0
+        # The cookie only ever extends one window past now
+        return min(until, time.time() + self.window_seconds)
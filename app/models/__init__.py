@@ -2,5 +2,15 @@ from .user import User
 from .construct import Construct
 from .construct_link import ConstructLink
 from .construct_relationship_fragment import ConstructRelationshipFragment
+from .checkpoint import GraphCheckpoint, GraphCheckpointWrite
+from .conversation_summary import ConversationSummary
 
-__all__ = ["User", "Construct", "ConstructLink", "ConstructRelationshipFragment"]
\ No newline at end of file
+__all__ = [
+    "User",
+    "Construct",
+    "ConstructLink",
+    "ConstructRelationshipFragment",
+    "GraphCheckpoint",
+    "GraphCheckpointWrite",
+    "ConversationSummary",
+]
\ No newline at end of file
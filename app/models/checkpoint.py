@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Integer, LargeBinary, DateTime, func, Index
+from app.db.database import Base
+
+
+class GraphCheckpoint(Base):
+    __tablename__ = "checkpoints"
+    thread_id = Column(String, primary_key=True)
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    checkpoint_id = Column(String, primary_key=True)
+    parent_checkpoint_id = Column(String, nullable=True)
+    checkpoint_type = Column(String, nullable=False)
+    checkpoint_blob = Column(LargeBinary, nullable=False)
+    metadata_type = Column(String, nullable=False)
+    metadata_blob = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class GraphCheckpointWrite(Base):
+    __tablename__ = "checkpoint_writes"
+    thread_id = Column(String, primary_key=True)
+    checkpoint_ns = Column(String, primary_key=True, default="")
+    checkpoint_id = Column(String, primary_key=True)
+    task_id = Column(String, primary_key=True)
+    idx = Column(Integer, primary_key=True)
+    channel = Column(String, nullable=False)
+    value_type = Column(String, nullable=False)
+    value_blob = Column(LargeBinary, nullable=False)
+    task_path = Column(String, nullable=False, default="")
+
+    __table_args__ = (
+        Index('idx_checkpoint_writes_thread', 'thread_id'),
+    )
@@ -1,9 +1,18 @@
-from sqlalchemy import Column, String, DateTime, func, ForeignKey
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, func, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB, UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 import uuid
 from app.db.database import Base
 
+# Full-text document: name, then identity/archetype, then psychographics/lifestyle
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{identity}', '{}'::jsonb), '[\"string\"]'::jsonb), 'B') || "
+    "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{archetype}', '{}'::jsonb), '[\"string\"]'::jsonb), 'B') || "
+    "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{psychographics}', '{}'::jsonb), '[\"string\"]'::jsonb), 'C') || "
+    "setweight(jsonb_to_tsvector('english'::regconfig, coalesce(data #> '{lifestyle}', '{}'::jsonb), '[\"string\"]'::jsonb), 'C')"
+)
+
 class Construct(Base):
     __tablename__ = "constructs"
     id = Column(UUID(as_uuid=True), primary_key=True,
@@ -14,6 +23,14 @@ class Construct(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True),
                         onupdate=func.now(), default=func.now())
+    # Maintained by Postgres; deferred so regular loads skip it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
     
     # Relationship to User
-    creator = relationship("User", back_populates="constructs")
\ No newline at end of file
+    creator = relationship("User", back_populates="constructs")
+
+    __table_args__ = (
+        Index('idx_constructs_creator_created', 'creator_id', 'created_at', 'id'),
+        Index('idx_constructs_data_gin', 'data', postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'}),
+        Index('idx_constructs_search_vector', 'search_vector', postgresql_using='gin'),
+    )
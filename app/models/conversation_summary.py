@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, func, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.database import Base
+
+
+class ConversationSummary(Base):
+    __tablename__ = "conversation_summaries"
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    thread_id = Column(String, primary_key=True)
+    message_count = Column(Integer, nullable=False)
+    prefix_hash = Column(String(64), nullable=False)
+    notes = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
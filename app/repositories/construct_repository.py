@@ -3,12 +3,36 @@ Construct repository for data access and business logic.
 Handles construct data loading, transformation, and validation.
 """
 
+import json
 import logging
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.crud.construct import get_construct_by_id
+from app.config.config import settings
+from app.crud.construct import get_construct_by_id, get_user_with_construct
+from app.crud.construct_link import get_links_with_fragments
+from app.models.user import User
+from app.services.construct_cache_service import construct_cache_service
+from app.utils.token_utils import count_text_tokens
+
+# Key in AsyncSession.info; sessions are request-scoped, so this memoizes per request
+REQUEST_CONTEXT_KEY = "request_context"
+
+
+@dataclass
+class RequestContext:
+    """User and construct snapshot loaded together for one request."""
+    user: Optional[User]
+    construct_data: Optional[Dict[str, Any]]
+
+    def is_owner(self) -> bool:
+        """Whether the loaded construct belongs to the loaded user."""
+        return bool(
+            self.user and self.construct_data
+            and self.construct_data.get("creator_id") == self.user.id
+        )
 
 
 class ConstructRepository:
@@ -25,6 +49,14 @@ class ConstructRepository:
         """Load and transform construct data from database."""
         if not construct_id:
             return None
+        
+        context = self._find_loaded_context(db, construct_id)
+        if context:
+            return context.construct_data
+        
+        cached = construct_cache_service.get_construct(construct_id)
+        if cached:
+            return cached
             
         try:
             construct = await get_construct_by_id(db, construct_id)
@@ -33,6 +65,7 @@ class ConstructRepository:
                 return None
             
             construct_data = self._transform_construct_to_dict(construct)
+            construct_cache_service.set_construct(construct_id, construct_data)
             
             self.logger.info(f"Loaded construct: {construct_data.get('name')}")
             return construct_data
@@ -41,6 +74,128 @@ class ConstructRepository:
             self.logger.warning(f"Error fetching construct {construct_id}: {e}")
             return None
     
+    async def load_request_context(
+        self,
+        user_id: UUID,
+        construct_id: Optional[UUID],
+        db: AsyncSession
+    ) -> RequestContext:
+        """
+        Load the user and construct in one query, memoized on the request's session.
+        
+        A construct already in the process-wide cache is not re-read, leaving
+        only the user lookup. Later get_construct/get_construct_data calls on
+        the same session reuse the loaded construct instead of querying again.
+        """
+        contexts = db.info.setdefault(REQUEST_CONTEXT_KEY, {})
+        key = (user_id, construct_id)
+        if key in contexts:
+            return contexts[key]
+        
+        construct_data = construct_cache_service.get_construct(construct_id) if construct_id else None
+        if construct_data:
+            user, _ = await get_user_with_construct(db, user_id, None)
+        else:
+            user, construct = await get_user_with_construct(db, user_id, construct_id)
+            if construct:
+                construct_data = self._transform_construct_to_dict(construct)
+                construct_cache_service.set_construct(construct_id, construct_data)
+        
+        context = RequestContext(user=user, construct_data=construct_data)
+        contexts[key] = context
+        return context
+    
+    def _find_loaded_context(
+        self,
+        db: AsyncSession,
+        construct_id: UUID
+    ) -> Optional[RequestContext]:
+        """Return a context already loaded on this session for the construct, if any."""
+        for (_, loaded_construct_id), context in db.info.get(REQUEST_CONTEXT_KEY, {}).items():
+            if loaded_construct_id == construct_id and context.construct_data is not None:
+                return context
+        return None
+    
+    async def get_relationship_context(
+        self,
+        construct_id: Optional[UUID],
+        db: AsyncSession
+    ) -> List[Dict[str, Any]]:
+        """
+        Get linked constructs and their most recent fragments for the system prompt.
+        
+        Loaded with one eager query and cached with the construct, so repeat
+        turns add no database round trips.
+        """
+        max_tokens = settings.relationship_context_max_tokens
+        if not construct_id or max_tokens <= 0:
+            return []
+        
+        cached = construct_cache_service.get_relationships(construct_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            links = await get_links_with_fragments(db, construct_id)
+        except Exception as e:
+            self.logger.warning(f"Error fetching relationships for construct {construct_id}: {e}")
+            return []
+        
+        relationships = self._build_relationship_context(construct_id, links, max_tokens)
+        construct_cache_service.set_relationships(construct_id, relationships)
+        return relationships
+    
+    def _build_relationship_context(
+        self,
+        construct_id: UUID,
+        links: List[Any],
+        max_tokens: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fit relationships into a token budget.
+        
+        Every linked construct is listed first (as far as the budget allows);
+        the remaining budget goes to fragments, newest first across all links.
+        """
+        budget = max_tokens
+        relationships = []
+        entries_by_link = {}
+        for link in links:
+            other = link.target if link.source_id == construct_id else link.source
+            entry = {
+                "name": other.name,
+                "link_type": link.link_type,
+                "label": link.label,
+                "notes": link.notes,
+                "fragments": []
+            }
+            cost = count_text_tokens(" ".join(str(v) for v in entry.values() if v))
+            if cost > budget:
+                break
+            budget -= cost
+            relationships.append(entry)
+            entries_by_link[link.id] = entry
+        
+        fragments = [
+            fragment for link in links if link.id in entries_by_link
+            for fragment in link.fragments
+        ]
+        fragments.sort(
+            key=lambda fragment: fragment.created_at.timestamp() if fragment.created_at else 0,
+            reverse=True
+        )
+        for fragment in fragments:
+            text = json.dumps(fragment.data, default=str)
+            cost = count_text_tokens(text)
+            if cost > budget:
+                continue
+            budget -= cost
+            entries_by_link[fragment.construct_link_id]["fragments"].append(
+                {"context_tag": fragment.context_tag, "data": text}
+            )
+        
+        return relationships
+    
     def _transform_construct_to_dict(self, construct) -> Dict[str, Any]:
         """Transform construct model to dictionary format."""
         if hasattr(construct, "model_dump"):
@@ -1,20 +1,68 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from typing import Optional
 from uuid import UUID
 
 from app.schemas.chat_models import ChatRequest, SummarizeRequest, SummarizeResponse
 from app.db.session import get_db
 from app.services.chat_service import ChatService
+from app.services.llm_client_registry import llm_client_registry
+from app.services.memory_service import memory_service
+from app.services.rolling_summary_service import rolling_summary_service
+from app.services.construct_cache_service import construct_cache_service
+from app.services.cache_invalidation_service import cache_invalidation_listener
+from app.services.relationship_graph_service import relationship_graph_service
+from app.services.token_verification_service import token_verification_service
+from app.services.admission_control_service import admission_control_service, AdmissionRejectedError
 from app.middleware.auth_supabase import get_current_user
-from app.models.user import User
+from app.repositories.construct_repository import construct_repository
 
 router = APIRouter(prefix="/v1")
 
 
 chat_service = ChatService()
 
+
+async def _check_request_context(
+    user_id: UUID,
+    construct_id: Optional[UUID],
+    db: AsyncSession
+) -> Optional[JSONResponse]:
+    """Load user and construct for the request; return an error response if access fails."""
+    context = await construct_repository.load_request_context(user_id, construct_id, db)
+    
+    if not context.user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "User not found"}
+        )
+    if construct_id and not context.construct_data:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Construct not found"}
+        )
+    if construct_id and not context.is_owner():
+        return JSONResponse(
+            status_code=403,
+            content={"error": "Access denied"}
+        )
+    return None
+
+def _admission_rejected_response(error: AdmissionRejectedError) -> JSONResponse:
+    """429/503 with Retry-After for a generation that was not admitted."""
+    return JSONResponse(
+        status_code=error.status_code,
+        content={
+            "error": {
+                "message": error.detail,
+                "type": "rate_limit_error" if error.status_code == 429 else "overloaded_error",
+                "code": error.status_code
+            }
+        },
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
 @router.post("/chat/completions", response_model=None)
 async def chat_completions(
     request: ChatRequest,
@@ -23,14 +71,9 @@ async def chat_completions(
 ):
     """chat completions endpoint using state graphs."""
     
-    result = await db.execute(select(User).filter(User.id == current_user_id))
-    current_user = result.scalar_one_or_none()
-    
-    if not current_user:
-        return JSONResponse(
-            status_code=401,
-            content={"error": "User not found"}
-        )
+    context_error = await _check_request_context(current_user_id, request.construct_id, db)
+    if context_error:
+        return context_error
     
     if not chat_service.is_available():
         return JSONResponse(
@@ -52,6 +95,8 @@ async def chat_completions(
         
         return response
         
+    except AdmissionRejectedError as e:
+        return _admission_rejected_response(e)
     except Exception as e:
         print(f"❌ Enhanced chat processing failed: {e}")
         return JSONResponse(
@@ -73,14 +118,9 @@ async def summarize_chat(
 ):
     """Summarize a chat conversation."""
     
-    result = await db.execute(select(User).filter(User.id == current_user_id))
-    current_user = result.scalar_one_or_none()
-    
-    if not current_user:
-        return JSONResponse(
-            status_code=401,
-            content={"error": "User not found"}
-        )
+    context_error = await _check_request_context(current_user_id, request.construct_id, db)
+    if context_error:
+        return context_error
     
     if not chat_service.is_available():
         return JSONResponse(
@@ -103,6 +143,8 @@ async def summarize_chat(
         
         return response
         
+    except AdmissionRejectedError as e:
+        return _admission_rejected_response(e)
     except Exception as e:
         print(f"❌ Chat summarization failed: {e}")
         return JSONResponse(
@@ -129,5 +171,13 @@ async def chat_health():
             "system_prompt_injection",
             "memory_management",
             "streaming_support"
-        ]
+        ],
+        "llm_client_cache": llm_client_registry.stats(),
+        "memory": memory_service.get_memory_stats(),
+        "rolling_summary": rolling_summary_service.stats(),
+        "construct_cache": construct_cache_service.stats(),
+        "cache_invalidation": cache_invalidation_listener.stats(),
+        "relationship_graph": relationship_graph_service.stats(),
+        "token_verification": token_verification_service.stats(),
+        "llm_admission": admission_control_service.stats()
     }
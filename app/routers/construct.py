@@ -1,24 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from uuid import UUID
-from typing import List
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
 import logging
 
 from app.schemas.construct_models import (
     ConstructCreateRequest, 
     ConstructUpdateRequest, 
-    ConstructResponse
+    ConstructPatchRequest,
+    ConstructResponse,
+    ConstructListItem,
+    ConstructSearchRequest,
+    ConstructBatchRequest,
+    ConstructBatchError,
+    ConstructBatchResponse,
+    CONSTRUCT_LIST_FIELDS
 )
+from app.schemas.construct_transfer_models import ConstructImportResponse
 from app.db.session import get_db
 from app.crud import construct as construct_crud
+from app.utils.pagination_utils import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+from app.utils.etag_utils import etag_matches, make_etag
+from app.db.routing import use_primary
 from app.models.construct import Construct
 from app.middleware.auth_supabase import get_current_user
+from app.services.construct_cache_service import construct_cache_service
+from app.services.cache_invalidation_service import notify_construct_changed
+from app.services.relationship_graph_service import relationship_graph_service
+from app.services.construct_transfer_service import construct_transfer_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/constructs", tags=["constructs"])
 
+def _construct_etag(construct_id: UUID, updated_at: Optional[datetime]) -> str:
+    """ETag of a single construct version."""
+    return make_etag(construct_id, updated_at.isoformat() if updated_at else None)
+
+def _page_etag(rows: Sequence[Any], has_more: bool, fields: Optional[List[str]]) -> str:
+    """ETag of a listing page, aggregated over the (id, updated_at) of its rows."""
+    versions = [f"{row['id']}:{row['updated_at'].isoformat() if row['updated_at'] else ''}" for row in rows]
+    return make_etag(",".join(fields or CONSTRUCT_LIST_FIELDS), has_more, *versions)
+
+def _set_etag(response: Response, etag: str) -> None:
+    """Attach an ETag and ask clients to revalidate before reusing the response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+def _not_modified(etag: str) -> Response:
+    """304 response for a matching If-None-Match."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
+def _validate_fields(fields: List[str]) -> List[str]:
+    """Reject projection fields that are not construct columns."""
+    unknown = set(fields) - set(CONSTRUCT_LIST_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return fields
+
 @router.post("/", response_model=ConstructResponse, status_code=status.HTTP_201_CREATED)
 async def create_construct(
     construct_request: ConstructCreateRequest,
@@ -43,6 +91,7 @@ async def create_construct(
             creator_id=current_user_id
         )
         created_construct = await construct_crud.create_construct(db, new_construct)
+        construct_cache_service.invalidate(created_construct.id)
         
         return ConstructResponse.model_validate(created_construct)
         
@@ -53,24 +102,92 @@ async def create_construct(
             detail="Failed to create construct"
         )
 
+@router.get("/export")
+async def export_constructs(
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Export the current user's constructs, links and fragments as NDJSON.
+    
+    Each line is a JSON object with a "type" of construct, link or fragment;
+    constructs come first, then links, then fragments.
+    
+    Args:
+        current_user_id (UUID): The current authenticated user ID.
+    
+    Returns:
+        StreamingResponse: The NDJSON stream.
+    """
+    return StreamingResponse(
+        construct_transfer_service.export_ndjson(current_user_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="constructs.ndjson"'}
+    )
+
+@router.post("/import", response_model=ConstructImportResponse)
+async def import_constructs(
+    request: Request,
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Import constructs, links and fragments from an NDJSON body (as produced by /export).
+    
+    Records are upserted in batches; imported constructs belong to the current
+    user, and records touching other users' data are skipped.
+    
+    Args:
+        request (Request): The request whose body is streamed.
+        current_user_id (UUID): The current authenticated user ID.
+    
+    Returns:
+        ConstructImportResponse: Counts of imported and skipped records, with line errors.
+    """
+    try:
+        return await construct_transfer_service.import_ndjson(request.stream(), current_user_id)
+        
+    except Exception as e:
+        logger.error(f"Error importing constructs for user {current_user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import constructs"
+        )
+
 @router.get("/{construct_id}", response_model=ConstructResponse)
 async def get_construct(
     construct_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user_id: UUID = Depends(get_current_user)
 ):
     """
     Get a construct by ID.
     
+    The response carries an ETag derived from updated_at. A matching
+    If-None-Match is answered with 304 from the construct cache or a
+    SELECT of updated_at, without loading the construct data.
+    
     Args:
         construct_id (UUID): The ID of the construct to retrieve.
+        response (Response): Used to set the ETag.
+        if_none_match (Optional[str]): ETags the client already holds.
         db (AsyncSession): The database session.
         current_user_id (UUID): The current authenticated user ID.
     
     Returns:
-        ConstructResponse: The construct data.
+        ConstructResponse: The construct data, or 304 if unchanged.
     """
     try:
+        if if_none_match:
+            version = (
+                construct_cache_service.get_construct(construct_id)
+                or await construct_crud.get_construct_version(db, construct_id)
+            )
+            if version and version["creator_id"] == current_user_id:
+                etag = _construct_etag(construct_id, version["updated_at"])
+                if etag_matches(if_none_match, etag):
+                    return _not_modified(etag)
+        
         construct = await construct_crud.get_construct_by_id(db, construct_id)
         
         if not construct:
@@ -84,6 +201,7 @@ async def get_construct(
                 detail="Access denied"
             )
         
+        _set_etag(response, _construct_etag(construct_id, construct.updated_at))
         return ConstructResponse.model_validate(construct)
         
     except HTTPException:
@@ -95,28 +213,94 @@ async def get_construct(
             detail="Failed to retrieve construct"
         )
 
-@router.get("/", response_model=List[ConstructResponse])
+@router.get("/", response_model=List[ConstructListItem], response_model_exclude_unset=True)
 async def get_user_constructs(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user_id: UUID = Depends(get_current_user)
 ):
     """
-    Get all constructs for the current user.
+    Get the current user's constructs, oldest first.
+    
+    Without limit or cursor every construct is returned. Passing either
+    switches to keyset pagination (DEFAULT_PAGE_SIZE rows unless limit is
+    given) and X-Next-Cursor is set when more rows follow.
+    
+    The page ETag aggregates the (id, updated_at) of its rows. A matching
+    If-None-Match is answered with 304 after a keyset query over those two
+    columns, without loading the construct data.
     
     Args:
+        response (Response): Used to return the next page cursor and ETag.
+        limit (Optional[int]): Maximum number of constructs per page.
+        cursor (Optional[str]): Cursor from the previous page's X-Next-Cursor header.
+        fields (Optional[str]): Comma-separated fields to return (e.g. "id,name");
+            omit "data" to skip loading the JSONB blobs.
+        if_none_match (Optional[str]): ETags the client already holds.
         db (AsyncSession): The database session.
         current_user_id (UUID): The current authenticated user ID.
     
     Returns:
-        List[ConstructResponse]: List of user's constructs.
+        List[ConstructListItem]: The constructs (or page of them), or 304 if unchanged.
+        X-Next-Cursor is set when more follow.
     """
+    selected = None
+    if fields:
+        selected = _validate_fields([field.strip() for field in fields.split(",") if field.strip()])
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    
     try:
-        result = await db.execute(
-            select(Construct).where(Construct.creator_id == current_user_id)
-        )
-        constructs = result.scalars().all()
+        if if_none_match:
+            versions, more = await construct_crud.get_constructs_page(
+                db, current_user_id, limit, after=after, fields=["updated_at"]
+            )
+            etag = _page_etag(versions, more, selected)
+            if etag_matches(if_none_match, etag):
+                return _not_modified(etag)
         
-        return [ConstructResponse.model_validate(construct) for construct in constructs]
+        if selected:
+            # updated_at is always loaded for the page ETag, but only returned if requested
+            rows, has_more = await construct_crud.get_constructs_page(
+                db, current_user_id, limit, after=after,
+                fields=list(dict.fromkeys([*selected, "updated_at"]))
+            )
+            _set_etag(response, _page_etag(rows, has_more, selected))
+        else:
+            rows, has_more = await construct_crud.get_constructs_page(db, current_user_id, limit, after=after)
+            _set_etag(response, _page_etag(
+                [{"id": row.id, "updated_at": row.updated_at} for row in rows], has_more, selected
+            ))
+        
+        if has_more:
+            last = rows[-1]
+            if selected:
+                response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+            else:
+                response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+        
+        if selected:
+            # Only the requested fields are set, so only they are serialized
+            return [
+                ConstructListItem(**{field: row[field] for field in ["id", *selected]})
+                for row in rows
+            ]
+        return [ConstructListItem.model_validate(construct) for construct in rows]
         
     except Exception as e:
         logger.error(f"Error retrieving constructs for user {current_user_id}: {e}")
@@ -125,6 +309,100 @@ async def get_user_constructs(
             detail="Failed to retrieve constructs"
         )
 
+@router.post("/search", response_model=List[ConstructListItem], response_model_exclude_unset=True)
+async def search_constructs(
+    search_request: ConstructSearchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Search the current user's constructs.
+    
+    Args:
+        search_request (ConstructSearchRequest): Full-text query, JSONB containment
+            and SQL/JSON path filters, plus optional field projection.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+    
+    Returns:
+        List[ConstructListItem]: Matching constructs, best match first for text queries.
+    """
+    fields = _validate_fields(search_request.fields) if search_request.fields else None
+    
+    try:
+        rows = await construct_crud.search_constructs(
+            db,
+            current_user_id,
+            search_request.limit,
+            query=search_request.q,
+            contains=search_request.contains,
+            path=search_request.path,
+            fields=fields
+        )
+        selected = fields or list(CONSTRUCT_LIST_FIELDS)
+        return [
+            ConstructListItem(**{field: row[field] for field in dict.fromkeys(["id", *selected])})
+            for row in rows
+        ]
+        
+    except DBAPIError as e:
+        # Malformed jsonpath expressions are rejected by Postgres
+        logger.warning(f"Rejected construct search for user {current_user_id}: {e.orig}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid search expression"
+        )
+    except Exception as e:
+        logger.error(f"Error searching constructs for user {current_user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search constructs"
+        )
+
+@router.post("/batch", response_model=ConstructBatchResponse)
+async def get_constructs_batch(
+    batch_request: ConstructBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Get several constructs by ID in one query.
+    
+    Args:
+        batch_request (ConstructBatchRequest): The construct IDs to fetch.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+    
+    Returns:
+        ConstructBatchResponse: The owned constructs in request order, plus a
+        not_found or forbidden marker for every other requested ID.
+    """
+    construct_ids = list(dict.fromkeys(batch_request.ids))
+    
+    try:
+        found = {
+            construct.id: construct
+            for construct in await construct_crud.get_constructs_by_ids(db, construct_ids)
+        }
+        
+        batch = ConstructBatchResponse()
+        for construct_id in construct_ids:
+            construct = found.get(construct_id)
+            if not construct:
+                batch.errors.append(ConstructBatchError(id=construct_id, error="not_found"))
+            elif construct.creator_id != current_user_id:
+                batch.errors.append(ConstructBatchError(id=construct_id, error="forbidden"))
+            else:
+                batch.constructs.append(ConstructResponse.model_validate(construct))
+        return batch
+        
+    except Exception as e:
+        logger.error(f"Error retrieving construct batch for user {current_user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve constructs"
+        )
+
 @router.put("/{construct_id}", response_model=ConstructResponse)
 async def update_construct(
     construct_id: UUID,
@@ -144,6 +422,8 @@ async def update_construct(
     Returns:
         ConstructResponse: The updated construct.
     """
+    use_primary(db)
+    
     try:
         construct = await construct_crud.get_construct_by_id(db, construct_id)
         
@@ -164,7 +444,10 @@ async def update_construct(
         if construct_update.data is not None:
             construct.data = construct_update.data
         
+        await notify_construct_changed(db, construct_id, current_user_id)
         await db.commit()
+        construct_cache_service.invalidate(construct_id)
+        relationship_graph_service.invalidate_user(current_user_id)
         await db.refresh(construct)
         
         return ConstructResponse.model_validate(construct)
@@ -179,6 +462,89 @@ async def update_construct(
             detail="Failed to update construct"
         )
 
+@router.patch("/{construct_id}", response_model=ConstructResponse)
+async def patch_construct(
+    construct_id: UUID,
+    construct_patch: ConstructPatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Partially update a construct's data without sending the whole document.
+    
+    The merge patch and JSON Patch operations are applied by Postgres in a
+    single UPDATE. If expected_updated_at is given and the construct has been
+    modified since, nothing is written and 409 is returned. An operation on a
+    path that does not exist (or, for add, whose parent does not exist) fails
+    the whole patch with 422.
+    
+    Args:
+        construct_id (UUID): The ID of the construct to patch.
+        construct_patch (ConstructPatchRequest): The patch to apply.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+    
+    Returns:
+        ConstructResponse: The patched construct.
+    """
+    use_primary(db)
+    
+    if construct_patch.name is None and construct_patch.merge is None and not construct_patch.operations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nothing to update"
+        )
+    
+    # Owner only: the JSONB data never leaves Postgres
+    version = await construct_crud.get_construct_version(db, construct_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Construct not found"
+        )
+    if version["creator_id"] != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    try:
+        patched = await construct_crud.patch_construct(
+            db,
+            construct_id,
+            name=construct_patch.name,
+            merge_patch=construct_patch.merge,
+            operations=[operation.model_dump() for operation in construct_patch.operations or []],
+            expected_updated_at=construct_patch.expected_updated_at
+        )
+    except DBAPIError as e:
+        logger.warning(f"Rejected patch for construct {construct_id}: {e.orig}")
+        if getattr(e.orig, "sqlstate", None) == construct_crud.PATCH_PATH_NOT_FOUND:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Patch path does not exist in construct data"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Patch could not be applied to construct data"
+        )
+    except Exception as e:
+        logger.error(f"Error patching construct {construct_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update construct"
+        )
+    
+    if not patched:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Construct was modified since expected_updated_at"
+        )
+    
+    construct_cache_service.invalidate(construct_id)
+    relationship_graph_service.invalidate_user(current_user_id)
+    return ConstructResponse.model_validate(patched)
+
 @router.delete("/{construct_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_construct(
     construct_id: UUID,
@@ -193,6 +559,8 @@ async def delete_construct(
         db (AsyncSession): The database session.
         current_user_id (UUID): The current authenticated user ID.
     """
+    use_primary(db)
+    
     try:
         construct = await construct_crud.get_construct_by_id(db, construct_id)
         
@@ -209,7 +577,10 @@ async def delete_construct(
             )
         
         await db.delete(construct)
+        await notify_construct_changed(db, construct_id, current_user_id)
         await db.commit()
+        construct_cache_service.invalidate(construct_id)
+        relationship_graph_service.invalidate_user(current_user_id)
         
     except HTTPException:
         raise
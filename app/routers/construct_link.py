@@ -0,0 +1,239 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from typing import Optional
+import logging
+
+from app.schemas.construct_link_models import (
+    ConstructLinkCreateRequest,
+    ConstructLinkResponse,
+    RelationshipFragmentCreateRequest,
+    RelationshipFragmentResponse,
+    ConstructGraphResponse
+)
+from app.db.session import get_db
+from app.db.routing import use_primary
+from app.crud import construct as construct_crud
+from app.crud import construct_link as link_crud
+from app.models.construct import Construct
+from app.models.construct_link import ConstructLink
+from app.models.construct_relationship_fragment import ConstructRelationshipFragment
+from app.middleware.auth_supabase import get_current_user
+from app.services.relationship_graph_service import relationship_graph_service
+from app.services.construct_cache_service import construct_cache_service
+from app.services.cache_invalidation_service import notify_construct_changed
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/constructs", tags=["construct links"])
+
+async def _get_owned_construct(
+    db: AsyncSession,
+    construct_id: UUID,
+    current_user_id: UUID
+) -> Construct:
+    """Load a construct, raising 404/403 unless it belongs to the current user."""
+    construct = await construct_crud.get_construct_by_id(db, construct_id)
+    if not construct:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Construct not found"
+        )
+    if construct.creator_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return construct
+
+async def _get_construct_link(
+    db: AsyncSession,
+    construct_id: UUID,
+    link_id: UUID
+) -> ConstructLink:
+    """Load a link that touches the given construct, raising 404 otherwise."""
+    link = await link_crud.get_link_by_id(db, link_id)
+    if not link or construct_id not in (link.source_id, link.target_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Link not found"
+        )
+    return link
+
+async def _notify_link_changed(db: AsyncSession, user_id: UUID, *construct_ids: UUID) -> None:
+    """Queue cross-worker invalidation for both ends of a link; sent when the write commits."""
+    for construct_id in construct_ids:
+        await notify_construct_changed(db, construct_id, user_id)
+
+def _invalidate_link_caches(user_id: UUID, *construct_ids: UUID) -> None:
+    """Drop this worker's cached traversals and prompt relationship context for a link change."""
+    relationship_graph_service.invalidate_user(user_id)
+    for construct_id in construct_ids:
+        construct_cache_service.invalidate(construct_id)
+
+@router.get("/{construct_id}/graph", response_model=ConstructGraphResponse)
+async def get_construct_graph(
+    construct_id: UUID,
+    depth: int = Query(1, ge=1, le=5),
+    context_tag: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Get the relationship neighborhood of a construct.
+
+    Args:
+        construct_id (UUID): The construct at the center of the graph.
+        depth (int): Maximum number of hops to follow.
+        context_tag (Optional[str]): Only include relationship fragments with this tag.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+
+    Returns:
+        ConstructGraphResponse: Reached constructs, the links between them and their fragments.
+    """
+    construct = await _get_owned_construct(db, construct_id, current_user_id)
+
+    try:
+        return await relationship_graph_service.get_neighborhood(
+            db, current_user_id, construct_id, construct.name, depth, context_tag
+        )
+
+    except Exception as e:
+        logger.error(f"Error building graph for construct {construct_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve construct graph"
+        )
+
+@router.post("/{construct_id}/links", response_model=ConstructLinkResponse, status_code=status.HTTP_201_CREATED)
+async def create_construct_link(
+    construct_id: UUID,
+    link_request: ConstructLinkCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Link a construct to another construct owned by the same user.
+
+    Args:
+        construct_id (UUID): The source construct.
+        link_request (ConstructLinkCreateRequest): The target and link details.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+
+    Returns:
+        ConstructLinkResponse: The created link.
+    """
+    use_primary(db)
+    
+    if link_request.target_id == construct_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A construct cannot link to itself"
+        )
+    await _get_owned_construct(db, construct_id, current_user_id)
+    await _get_owned_construct(db, link_request.target_id, current_user_id)
+
+    try:
+        await _notify_link_changed(db, current_user_id, construct_id, link_request.target_id)
+        link = await link_crud.create_link(db, ConstructLink(
+            source_id=construct_id,
+            target_id=link_request.target_id,
+            link_type=link_request.link_type,
+            label=link_request.label,
+            notes=link_request.notes,
+            is_bidirectional=link_request.is_bidirectional
+        ))
+        _invalidate_link_caches(current_user_id, construct_id, link_request.target_id)
+
+        return ConstructLinkResponse.model_validate(link)
+
+    except Exception as e:
+        logger.error(f"Error linking construct {construct_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create construct link"
+        )
+
+@router.delete("/{construct_id}/links/{link_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_construct_link(
+    construct_id: UUID,
+    link_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Delete a construct link and its relationship fragments.
+
+    Args:
+        construct_id (UUID): A construct on either end of the link.
+        link_id (UUID): The link to delete.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+    """
+    use_primary(db)
+    await _get_owned_construct(db, construct_id, current_user_id)
+    link = await _get_construct_link(db, construct_id, link_id)
+
+    # Attributes expire on commit, and a deleted link cannot be reloaded
+    endpoint_ids = (link.source_id, link.target_id)
+    try:
+        await _notify_link_changed(db, current_user_id, *endpoint_ids)
+        await link_crud.delete_link(db, link)
+        _invalidate_link_caches(current_user_id, *endpoint_ids)
+
+    except Exception as e:
+        logger.error(f"Error deleting construct link {link_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete construct link"
+        )
+
+@router.post(
+    "/{construct_id}/links/{link_id}/fragments",
+    response_model=RelationshipFragmentResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_relationship_fragment(
+    construct_id: UUID,
+    link_id: UUID,
+    fragment_request: RelationshipFragmentCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: UUID = Depends(get_current_user)
+):
+    """
+    Attach a relationship fragment (tagged memory or detail) to a link.
+
+    Args:
+        construct_id (UUID): A construct on either end of the link.
+        link_id (UUID): The link to attach the fragment to.
+        fragment_request (RelationshipFragmentCreateRequest): The fragment tag and data.
+        db (AsyncSession): The database session.
+        current_user_id (UUID): The current authenticated user ID.
+
+    Returns:
+        RelationshipFragmentResponse: The created fragment.
+    """
+    use_primary(db)
+    await _get_owned_construct(db, construct_id, current_user_id)
+    link = await _get_construct_link(db, construct_id, link_id)
+    endpoint_ids = (link.source_id, link.target_id)
+
+    try:
+        await _notify_link_changed(db, current_user_id, *endpoint_ids)
+        fragment = await link_crud.create_fragment(db, ConstructRelationshipFragment(
+            construct_link_id=link_id,
+            context_tag=fragment_request.context_tag,
+            data=fragment_request.data
+        ))
+        _invalidate_link_caches(current_user_id, *endpoint_ids)
+
+        return RelationshipFragmentResponse.model_validate(fragment)
+
+    except Exception as e:
+        logger.error(f"Error creating fragment for link {link_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create relationship fragment"
+        )
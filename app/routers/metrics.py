@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from app.db.database import engine
+from app.db.instrumentation import db_metrics
+from app.services.admission_control_service import admission_control_service
+
+router = APIRouter(prefix="/v1", tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Runtime metrics for capacity monitoring.
+    
+    Returns:
+        dict: Connection pool occupancy, pool checkout-wait and query-latency
+        histograms, and per-model LLM slot usage, queue depth, rejections and
+        queue-wait histograms (seconds, cumulative buckets).
+    """
+    return {
+        "database": db_metrics.stats(engine),
+        "llm_admission": admission_control_service.stats()
+    }
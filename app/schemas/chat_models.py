@@ -70,6 +70,8 @@ class SummarizeRequest(BaseModel):
     construct_id: Optional[uuid.UUID] = None
     summary_style: Optional[Literal["journal_concise", "journal_reflective", "journal_note"]] = "journal_concise"
     mode: Optional[Literal["system", "construct"]] = "system"
+    chunked: Optional[bool] = None  # None: chunk automatically when the conversation is long
+    thread_id: Optional[str] = None  # Enables incremental summaries for this thread
 
 class SummarizeResponse(BaseModel):
     summary: str
@@ -0,0 +1,53 @@
+from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+import uuid
+from datetime import datetime
+
+class ConstructLinkCreateRequest(BaseModel):
+    target_id: uuid.UUID
+    link_type: Optional[str] = None
+    label: Optional[str] = None
+    notes: Optional[str] = None
+    is_bidirectional: bool = False
+
+class ConstructLinkResponse(BaseModel):
+    id: uuid.UUID
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+    link_type: Optional[str] = None
+    label: Optional[str] = None
+    notes: Optional[str] = None
+    is_bidirectional: bool
+    
+    class Config:
+        from_attributes = True
+
+class RelationshipFragmentCreateRequest(BaseModel):
+    context_tag: Optional[str] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+class RelationshipFragmentResponse(BaseModel):
+    id: uuid.UUID
+    construct_link_id: uuid.UUID
+    context_tag: Optional[str] = None
+    data: Dict[str, Any] = {}
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class ConstructGraphNode(BaseModel):
+    id: uuid.UUID
+    name: str
+    depth: int
+
+class ConstructGraphLink(ConstructLinkResponse):
+    source_depth: int
+    target_depth: int
+    fragments: List[RelationshipFragmentResponse] = []
+
+class ConstructGraphResponse(BaseModel):
+    root_id: uuid.UUID
+    depth: int
+    nodes: List[ConstructGraphNode]
+    links: List[ConstructGraphLink]
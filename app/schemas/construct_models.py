@@ -11,6 +11,19 @@ class ConstructUpdateRequest(BaseModel):
     name: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
 
+class JsonPatchOperation(BaseModel):
+    """One RFC 6902 operation on construct data (add, remove or replace)."""
+    op: Literal["add", "remove", "replace"]
+    path: str = Field(..., pattern=r"^(/[^/]*)+$")  # JSON pointer into data, e.g. "/identity/age"
+    value: Any = None
+
+class ConstructPatchRequest(BaseModel):
+    """Partial construct update; the merge patch is applied before the operations."""
+    name: Optional[str] = None
+    merge: Optional[Dict[str, Any]] = None  # RFC 7396 merge patch on data; null values remove keys
+    operations: Optional[List[JsonPatchOperation]] = None  # RFC 6902 operations on data
+    expected_updated_at: Optional[datetime] = None  # Reject with 409 if the construct changed since
+
 class ConstructResponse(BaseModel):
     id: uuid.UUID
     name: str
@@ -22,6 +35,40 @@ class ConstructResponse(BaseModel):
     class Config:
         from_attributes = True
 
+CONSTRUCT_LIST_FIELDS = ("id", "name", "data", "creator_id", "created_at", "updated_at")
+
+class ConstructListItem(BaseModel):
+    """Construct in a listing; only the requested fields are present."""
+    id: uuid.UUID
+    name: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    creator_id: Optional[uuid.UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class ConstructBatchRequest(BaseModel):
+    """IDs of constructs to fetch in one request."""
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=200)
+
+class ConstructBatchError(BaseModel):
+    id: uuid.UUID
+    error: Literal["not_found", "forbidden"]
+
+class ConstructBatchResponse(BaseModel):
+    constructs: List[ConstructResponse] = []  # Owned constructs, in request order
+    errors: List[ConstructBatchError] = []  # Requested IDs that were not returned
+
+class ConstructSearchRequest(BaseModel):
+    """Filters for searching the current user's constructs; all given filters must match."""
+    q: Optional[str] = None  # Full-text query over name and persona fields (web search syntax)
+    contains: Optional[Dict[str, Any]] = None  # JSONB containment on data, e.g. {"archetype": {"trope_tags": ["Reluctant hero"]}}
+    path: Optional[str] = None  # SQL/JSON path predicate on data, e.g. '$.demographic.age == "Ageless"'
+    fields: Optional[List[str]] = None
+    limit: int = Field(20, ge=1, le=100)
+
 # Legacy models for backward compatibility
 class ConstructRequest(BaseModel):
     user_id: uuid.UUID
\ No newline at end of file
@@ -0,0 +1,53 @@
+from typing import Optional, Dict, Any, Literal, Union
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import Annotated
+import uuid
+from datetime import datetime
+
+# One NDJSON line per record; constructs come first, then links, then fragments
+
+class ConstructRecord(BaseModel):
+    type: Literal["construct"] = "construct"
+    id: uuid.UUID
+    name: str
+    data: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class ConstructLinkRecord(BaseModel):
+    type: Literal["link"] = "link"
+    id: uuid.UUID
+    source_id: uuid.UUID
+    target_id: uuid.UUID
+    link_type: Optional[str] = None
+    label: Optional[str] = None
+    notes: Optional[str] = None
+    is_bidirectional: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class RelationshipFragmentRecord(BaseModel):
+    type: Literal["fragment"] = "fragment"
+    id: uuid.UUID
+    construct_link_id: uuid.UUID
+    context_tag: Optional[str] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+TransferRecord = Annotated[
+    Union[ConstructRecord, ConstructLinkRecord, RelationshipFragmentRecord],
+    Field(discriminator="type")
+]
+transfer_record_adapter = TypeAdapter(TransferRecord)
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+class ConstructImportResponse(BaseModel):
+    constructs: int = 0
+    links: int = 0
+    fragments: int = 0
+    skipped: int = 0
+    errors: list[ImportLineError] = []
@@ -0,0 +1,321 @@
+"""
+LLM admission control and scheduling.
+Caps concurrent generations per model. Requests over the cap wait in a bounded
+queue with a deadline; when the queue is full or the deadline passes they are
+rejected quickly with a Retry-After hint instead of piling onto Ollama.
+
+Waiting requests are served interactive-first. Background work (rolling and
+journal summaries) may hold only a share of a model's slots, and a queued
+background request is evicted when an interactive one needs its queue place.
+Within a priority class, users share slots by weighted fair queuing.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+
+from app.config.config import settings
+from app.utils.metrics_utils import Histogram
+
+# Weight of the newest sample in the per-model service time average
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class AdmissionRejectedError(Exception):
+    """A generation was not admitted; maps to an HTTP error with Retry-After."""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    priority: Priority
+    user_key: str
+    sequence: int
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
+class _ModelGate:
+    """Concurrency slots, wait queue, fair-share clocks and counters for one model."""
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int,
+        background_limit: int,
+        user_weights: Dict[str, float]
+    ):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.background_limit = background_limit
+        self.user_weights = user_weights
+        self.active = {priority: 0 for priority in Priority}
+        self.waiters: List[_Waiter] = []
+        # Weighted fair queuing: a user's virtual time advances by 1/weight per admission
+        self.virtual_times: Dict[str, float] = {}
+        self.wait_time = {priority: Histogram() for priority in Priority}
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.preempted = 0
+        self.service_time: Optional[float] = None
+
+    @property
+    def active_total(self) -> int:
+        return sum(self.active.values())
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average generation time."""
+        per_slot = (self.service_time or 1.0) / max(self.limit, 1)
+        return max(1, math.ceil(per_slot * (len(self.waiters) + 1)))
+
+    def enqueue(self, waiter: _Waiter) -> None:
+        """Queue a waiter, starting its user's fair-share clock no earlier than the waiting users'."""
+        waiting = {queued.user_key for queued in self.waiters}
+        if waiting:
+            floor = min(self.virtual_times[user_key] for user_key in waiting)
+        else:
+            floor = max(self.virtual_times.values(), default=0.0)
+        # Users returning from idle earn no credit for the time they were away
+        self.virtual_times[waiter.user_key] = max(self.virtual_times.get(waiter.user_key, floor), floor)
+        self.waiters.append(waiter)
+
+    def shed_overflow(self, waiter: _Waiter) -> None:
+        """
+        Keep the queue within max_queue after waiter joined it.
+
+        An interactive waiter evicts the newest queued background waiter;
+        otherwise the newcomer is rejected.
+        """
+        if len(self.waiters) <= self.max_queue or waiter not in self.waiters:
+            return
+
+        victim = None
+        if waiter.priority == Priority.INTERACTIVE:
+            background = [queued for queued in self.waiters if queued.priority == Priority.BACKGROUND]
+            victim = max(background, key=lambda queued: queued.sequence, default=None)
+
+        if victim is None:
+            self.waiters.remove(waiter)
+            self.rejected_queue_full += 1
+            raise AdmissionRejectedError(
+                429, self.retry_after(), "Too many pending requests for this model"
+            )
+
+        self.waiters.remove(victim)
+        self.preempted += 1
+        victim.future.set_exception(AdmissionRejectedError(
+            503, self.retry_after(), "Preempted by interactive requests"
+        ))
+
+    def dispatch(self) -> None:
+        """Grant free slots to waiters: interactive first, then by user virtual time, then FIFO."""
+        while self.waiters and self.active_total < self.limit:
+            eligible = [
+                waiter for waiter in self.waiters
+                if waiter.priority == Priority.INTERACTIVE
+                or self.active[Priority.BACKGROUND] < self.background_limit
+            ]
+            if not eligible:
+                return
+            waiter = min(eligible, key=lambda queued: (
+                queued.priority, self.virtual_times[queued.user_key], queued.sequence
+            ))
+            self.waiters.remove(waiter)
+            self.grant(waiter)
+
+    def grant(self, waiter: _Waiter) -> None:
+        self.active[waiter.priority] += 1
+        self.admitted += 1
+        self.virtual_times[waiter.user_key] += 1.0 / self.user_weights.get(waiter.user_key, 1.0)
+        self.wait_time[waiter.priority].observe(time.perf_counter() - waiter.queued_at)
+        waiter.future.set_result(None)
+
+    def release(self, priority: Priority, service_time: Optional[float] = None) -> None:
+        """Free a slot (recording how long it was held) and hand out free capacity."""
+        if service_time is not None:
+            if self.service_time is None:
+                self.service_time = service_time
+            else:
+                self.service_time += SERVICE_TIME_SMOOTHING * (service_time - self.service_time)
+        self.active[priority] -= 1
+        self.dispatch()
+        if not self.waiters and not self.active_total:
+            # Idle: fair-share history is no longer needed
+            self.virtual_times.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "background_limit": self.background_limit,
+            "active": {priority.name.lower(): count for priority, count in self.active.items()},
+            "queued": {
+                priority.name.lower(): sum(1 for waiter in self.waiters if waiter.priority == priority)
+                for priority in Priority
+            },
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "preempted": self.preempted,
+            "avg_service_seconds": round(self.service_time, 3) if self.service_time is not None else None,
+            "wait_seconds": {
+                priority.name.lower(): histogram.stats() for priority, histogram in self.wait_time.items()
+            }
+        }
+
+
+class AdmissionTicket:
+    """A held generation slot; release() is idempotent."""
+
+    def __init__(self, gate: _ModelGate, priority: Priority):
+        self._gate = gate
+        self._priority = priority
+        self._started = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._gate.release(self._priority, time.perf_counter() - self._started)
+
+
+class AdmissionControlService:
+    """Per-model concurrency limiter and priority scheduler for LLM calls."""
+
+    def __init__(
+        self,
+        default_limit: int = 4,
+        model_limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 32,
+        queue_timeout: float = 30.0,
+        background_queue_timeout: float = 120.0,
+        background_slot_share: float = 0.5,
+        user_weights: Optional[Dict[str, float]] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.default_limit = default_limit
+        self.model_limits = model_limits or {}
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.background_queue_timeout = background_queue_timeout
+        self.background_slot_share = background_slot_share
+        self.user_weights = user_weights or {}
+        self._gates: Dict[str, _ModelGate] = {}
+        self._sequence = itertools.count()
+
+    def _gate(self, model: str) -> _ModelGate:
+        gate = self._gates.get(model)
+        if gate is None:
+            limit = self.model_limits.get(model, self.default_limit)
+            gate = _ModelGate(
+                limit,
+                self.max_queue,
+                background_limit=max(1, math.floor(limit * self.background_slot_share)),
+                user_weights=self.user_weights
+            )
+            self._gates[model] = gate
+        return gate
+
+    async def acquire(
+        self,
+        model: str,
+        priority: Priority = Priority.INTERACTIVE,
+        user_id: Optional[UUID] = None
+    ) -> AdmissionTicket:
+        """
+        Wait for a generation slot for model.
+
+        Raises:
+            AdmissionRejectedError: 429 if the wait queue is full, 503 if no
+                slot frees up within the queue timeout or a queued background
+                request was preempted
+        """
+        gate = self._gate(model)
+        waiter = _Waiter(
+            future=asyncio.get_running_loop().create_future(),
+            priority=priority,
+            user_key=str(user_id) if user_id else "",
+            sequence=next(self._sequence)
+        )
+        gate.enqueue(waiter)
+        gate.dispatch()
+        gate.shed_overflow(waiter)
+
+        if not waiter.future.done():
+            timeout = self.queue_timeout if priority == Priority.INTERACTIVE else self.background_queue_timeout
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            except asyncio.TimeoutError:
+                self._abandon(gate, waiter)
+                gate.rejected_timeout += 1
+                raise AdmissionRejectedError(
+                    503, gate.retry_after(), f"Model {model} is at capacity"
+                )
+            except asyncio.CancelledError:
+                self._abandon(gate, waiter)
+                raise
+
+        # Raises if the waiter was preempted while queued
+        waiter.future.result()
+        return AdmissionTicket(gate, priority)
+
+    @staticmethod
+    def _abandon(gate: _ModelGate, waiter: _Waiter) -> None:
+        """Leave the queue; a slot granted just as we gave up is passed on."""
+        if waiter in gate.waiters:
+            gate.waiters.remove(waiter)
+        elif waiter.future.done() and waiter.future.exception() is None:
+            gate.release(waiter.priority)
+
+    def limit(self, model: str, priority: Priority = Priority.INTERACTIVE) -> int:
+        """Concurrent generations model allows at priority (background may use only its share)."""
+        gate = self._gate(model)
+        return gate.limit if priority == Priority.INTERACTIVE else gate.background_limit
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        model: str,
+        priority: Priority = Priority.INTERACTIVE,
+        user_id: Optional[UUID] = None
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Hold a generation slot for the duration of the block."""
+        ticket = await self.acquire(model, priority, user_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model slot usage, queue depth, rejections and wait-time histograms by priority."""
+        return {model: gate.stats() for model, gate in self._gates.items()}
+
+
+# Global admission controller and scheduler
+admission_control_service = AdmissionControlService(
+    default_limit=settings.llm_max_concurrency,
+    model_limits=settings.llm_model_concurrency,
+    max_queue=settings.llm_max_queue,
+    queue_timeout=settings.llm_queue_timeout_seconds,
+    background_queue_timeout=settings.llm_background_queue_timeout_seconds,
+    background_slot_share=settings.llm_background_slot_share,
+    user_weights=settings.llm_user_weights
+)
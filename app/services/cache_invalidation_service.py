@@ -0,0 +1,170 @@
+"""
+Cross-worker cache invalidation.
+Construct and link writes publish a Postgres NOTIFY on a dedicated channel;
+every worker holds one asyncpg LISTEN connection and evicts the affected
+construct cache entries and the owner's cached relationship traversals. If
+the listener has to reconnect, notifications may have been missed, so the
+caches are flushed completely.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.config import settings
+from app.services.construct_cache_service import construct_cache_service
+from app.services.relationship_graph_service import relationship_graph_service
+
+CONSTRUCT_CACHE_CHANNEL = "construct_cache_invalidation"
+# Payload asking every worker to flush its construct caches (e.g. after a bulk import)
+FLUSH_ALL_PAYLOAD = "*"
+# Separates the construct id from its owner's id in a payload
+PAYLOAD_SEPARATOR = ":"
+
+logger = logging.getLogger(__name__)
+
+
+async def notify_construct_changed(
+    db: AsyncSession,
+    construct_id: UUID,
+    user_id: Optional[UUID] = None
+) -> None:
+    """
+    Queue a construct invalidation notice on the current transaction.
+
+    With user_id, receivers also drop that user's cached relationship
+    traversals (link changes, renames and deletes alter neighborhoods).
+
+    NOTIFY is transactional: other workers receive it only once the caller
+    commits, and never if it rolls back.
+    """
+    payload = str(construct_id)
+    if user_id is not None:
+        payload += f"{PAYLOAD_SEPARATOR}{user_id}"
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CONSTRUCT_CACHE_CHANNEL, "payload": payload}
+    )
+
+
+async def notify_all_constructs_changed(db: AsyncSession) -> None:
+    """Queue a full construct cache flush on the current transaction."""
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CONSTRUCT_CACHE_CHANNEL, "payload": FLUSH_ALL_PAYLOAD}
+    )
+
+
+class CacheInvalidationListener:
+    """Holds one LISTEN connection per worker and applies invalidation notices."""
+
+    def __init__(
+        self,
+        database_url: str,
+        check_interval: float = 5.0,
+        max_backoff: float = 60.0
+    ):
+        # asyncpg takes a plain postgresql:// DSN
+        self._dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+        self._connected_once = False
+        self.notifications = 0
+        self.reconnects = 0
+        self.full_flushes = 0
+
+    def start(self) -> None:
+        """Start listening in the background (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                await self._connect()
+                backoff = 1.0
+                while not self._connection.is_closed():
+                    await asyncio.sleep(self.check_interval)
+                logger.warning("Cache invalidation listener lost its connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}; retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            finally:
+                await self._close()
+
+    async def _connect(self) -> None:
+        self._connection = await asyncpg.connect(self._dsn)
+        await self._connection.add_listener(CONSTRUCT_CACHE_CHANNEL, self._on_notification)
+
+        if self._connected_once:
+            # Notices sent while we were disconnected are lost
+            self.reconnects += 1
+            self.full_flushes += 1
+            construct_cache_service.clear()
+            relationship_graph_service.clear()
+            logger.info("Cache invalidation listener reconnected; flushed construct caches")
+        else:
+            logger.info(f"Listening for cache invalidations on '{CONSTRUCT_CACHE_CHANNEL}'")
+        self._connected_once = True
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection and not connection.is_closed():
+            try:
+                await connection.close(timeout=5)
+            except Exception:
+                connection.terminate()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.notifications += 1
+        if payload == FLUSH_ALL_PAYLOAD:
+            construct_cache_service.clear()
+            relationship_graph_service.clear()
+            return
+        try:
+            construct_id, _, user_id = payload.partition(PAYLOAD_SEPARATOR)
+            construct_cache_service.invalidate(UUID(construct_id))
+            if user_id:
+                relationship_graph_service.invalidate_user(UUID(user_id))
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache invalidation payload: {payload!r}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Listener connection state and counters."""
+        return {
+            "connected": bool(self._connection and not self._connection.is_closed()),
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+            "full_flushes": self.full_flushes
+        }
+
+
+# Global listener (started from the application lifespan)
+cache_invalidation_listener = CacheInvalidationListener(
+    settings.database_url,
+    check_interval=settings.cache_listener_check_interval_seconds
+)
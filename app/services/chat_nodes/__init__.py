@@ -1,11 +1,13 @@
 from .context_preparation_node import ContextPreparationNode
 from .system_prompt_injection_node import SystemPromptInjectionNode
+from .context_trimming_node import ContextTrimmingNode
 from .llm_processing_node import LLMProcessingNode
 from .response_formatting_node import ResponseFormattingNode
 
 __all__ = [
     "ContextPreparationNode",
     "SystemPromptInjectionNode", 
+    "ContextTrimmingNode",
     "LLMProcessingNode",
     "ResponseFormattingNode"
 ]
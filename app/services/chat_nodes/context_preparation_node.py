@@ -23,7 +23,8 @@ class ContextPreparationNode(BaseChatNode):
             result = {
                 "mode": request_data["mode"],
                 "thread_id": request_data["thread_id"],
-                "should_stream": request_data["stream"]
+                "should_stream": request_data["stream"],
+                "context_message_ids": None
             }
             
             self._log_processing_complete(f"mode: {result['mode']}, thread: {result['thread_id']}")
@@ -0,0 +1,53 @@
+"""
+Context trimming node service.
+Fits the system prompt and conversation history into the model's token budget.
+"""
+
+from typing import Dict, Any
+from .base_node import BaseChatNode
+from app.services.chat_service import ChatState
+from app.services.llm_config_service import llm_config_service
+from app.services.state_graph_service import state_graph_service
+from app.services.rolling_summary_service import build_summary_message, messages_after_watermark
+from app.utils.token_utils import count_message_tokens, count_messages_tokens
+
+
+class ContextTrimmingNode(BaseChatNode):
+    """Node for selecting the history window sent to the LLM."""
+    
+    async def process(self, state: ChatState) -> Dict[str, Any]:
+        """Select the most recent unsummarized messages that fit the per-model token budget."""
+        try:
+            self._log_processing_start("context trimming")
+            
+            request_data = state["request_data"]
+            messages = messages_after_watermark(
+                state.get("messages", []),
+                state.get("summary_watermark_id")
+            )
+            
+            budget = llm_config_service.get_context_budget(
+                request_data["model"],
+                request_data.get("max_tokens")
+            )
+            
+            # Reserve room for the rolling summary of older turns
+            summary_message = build_summary_message(state.get("conversation_summary"))
+            if summary_message:
+                budget -= count_message_tokens(summary_message)
+            
+            trimmer = state_graph_service.create_message_trimmer(max_tokens=budget)
+            context_messages = trimmer(messages)
+            
+            dropped = len(messages) - len(context_messages)
+            if dropped > 0:
+                self.logger.info(f"Trimmed {dropped} messages to fit {budget} token budget")
+            
+            result = {"context_message_ids": [message.id for message in context_messages]}
+            self._log_processing_complete(
+                f"{len(context_messages)} messages, {count_messages_tokens(context_messages)} tokens"
+            )
+            return result
+            
+        except Exception as e:
+            return self._handle_error(e, "context trimming")
@@ -3,22 +3,40 @@ LLM processing node service.
 Handles the core LLM processing with mode-aware configuration.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
+from langchain_core.messages import BaseMessage, SystemMessage
 from .base_node import BaseChatNode
 from app.services.chat_service import ChatState
 from app.services.llm_config_service import llm_config_service
+from app.services.rolling_summary_service import build_summary_message
 
 
 class LLMProcessingNode(BaseChatNode):
     """Node for processing messages through LLM with mode-aware configuration."""
     
+    def _select_context_messages(self, state: ChatState) -> List[BaseMessage]:
+        """Get the trimmed context window plus rolling summary, falling back to the full history."""
+        messages = state.get("messages", [])
+        context_ids = state.get("context_message_ids")
+        if context_ids:
+            messages_by_id = {message.id: message for message in messages}
+            messages = [messages_by_id[message_id] for message_id in context_ids if message_id in messages_by_id]
+        
+        # Older turns are represented by the rolling summary
+        summary_message = build_summary_message(state.get("conversation_summary"))
+        if summary_message:
+            insert_at = 1 if messages and isinstance(messages[0], SystemMessage) else 0
+            messages = messages[:insert_at] + [summary_message] + messages[insert_at:]
+        
+        return messages
+    
     async def process(self, state: ChatState) -> Dict[str, Any]:
         """Process messages through LLM with mode-aware configuration."""
         try:
             self._log_processing_start("LLM processing")
             
             request_data = state["request_data"]
-            messages = state.get("messages", [])
+            messages = self._select_context_messages(state)
             mode = state.get("mode", "chat")
             
 
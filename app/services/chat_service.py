@@ -2,6 +2,9 @@ from typing import List, Dict, Any, Optional, Annotated
 from typing_extensions import TypedDict
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+import asyncio
+import functools
+import hashlib
 import logging
 
 from langchain_core.messages import BaseMessage
@@ -12,11 +15,21 @@ from app.schemas.chat_models import ChatRequest, SummarizeRequest, SummarizeResp
 from app.services.state_graph_service import state_graph_service
 from app.services.model_service import model_service
 from app.services.prompt_template_service import prompt_template_service
+from app.services.rolling_summary_service import rolling_summary_service
+from app.services.admission_control_service import (
+    admission_control_service,
+    AdmissionRejectedError,
+    Priority
+)
+from app.config.config import settings
 from app.utils.message_utils import convert_chat_messages_to_langchain
 from app.utils.streaming_utils import create_streaming_response
 from app.repositories.construct_repository import construct_repository
+from app.crud.conversation_summary import get_conversation_summary, upsert_conversation_summary
+from app.db.session import release_connection
 from app.utils.graph_state_utils import prepare_graph_config, prepare_request_data, prepare_initial_state
 from app.utils.conversation_utils import count_new_messages, get_existing_conversation
+from app.utils.token_utils import chunk_texts_by_tokens, count_text_tokens
 
 
 logger = logging.getLogger(__name__)
@@ -27,6 +40,9 @@ class ChatState(TypedDict):
     user_id: Optional[str]
     construct_data: Optional[Dict[str, Any]]
     system_prompt: Optional[str]
+    context_message_ids: Optional[List[str]]
+    conversation_summary: Optional[str]
+    summary_watermark_id: Optional[str]
     mode: str
     thread_id: str
     response_content: Optional[str]
@@ -57,8 +73,12 @@ class ChatService:
     ):
         """Process a chat request using the consolidated graph architecture."""
         try:
-            # 1. Load construct data using repository  
-            construct_data = await construct_repository.get_construct(
+            # 1. Load user and construct once (memoized on the request's session)
+            context = await construct_repository.load_request_context(
+                user_id, request.construct_id, db
+            )
+            construct_data = context.construct_data
+            relationships = await construct_repository.get_relationship_context(
                 request.construct_id, db
             )
             
@@ -67,7 +87,9 @@ class ChatService:
                 request.messages, 
                 db, 
                 request.construct_id, 
-                request.mode
+                request.mode,
+                construct=construct_data,
+                relationships=relationships
             )        
             
             # 3. Handle conversation history using dedicated service
@@ -93,20 +115,50 @@ class ChatService:
                 thread_id=request.thread_id,
                 should_stream=request.stream
             )
-                  # 8. Execute graph (consolidated in state_graph_service)
-            result = await self.graph.ainvoke(initial_state, config=config)
+            # Everything the graph needs is loaded; don't hold a pooled connection through generation
+            await release_connection(db)
+            
+            # 8. Fold overflowing history into the rolling summary after the turn
+            def schedule_rolling_summary():
+                rolling_summary_service.schedule(
+                    self.graph, config, request_data,
+                    functools.partial(self.summarize_messages, user_id=user_id)
+                )
+            
+            # 9. Wait for a generation slot; over capacity this raises before any output is sent
+            ticket = await admission_control_service.acquire(
+                request.model, Priority.INTERACTIVE, user_id
+            )
+            
+            # 10. Stream tokens straight from the graph as they are generated
+            if request.stream:
+                try:
+                    return await create_streaming_response(
+                        self.graph, initial_state, config, request.model,
+                        on_complete=schedule_rolling_summary,
+                        on_close=ticket.release
+                    )
+                except Exception:
+                    ticket.release()
+                    raise
+            
+            # 11. Execute graph (consolidated in state_graph_service)
+            try:
+                result = await self.graph.ainvoke(initial_state, config=config)
+            finally:
+                ticket.release()
             
             if result.get("error"):
                 return JSONResponse(
                     status_code=500,
                     content={"error": result["error"]}
                 )
-     
-            if request.stream:
-                return await create_streaming_response(result)
-            else:
-                return result.get("response_content", {})
+            
+            schedule_rolling_summary()
+            return result.get("response_content", {})
                 
+        except AdmissionRejectedError:
+            raise
         except Exception as e:
             logger.error(f"Error processing chat request: {e}")
             return JSONResponse(
@@ -118,10 +170,15 @@ class ChatService:
         self,
         request: SummarizeRequest,
         db: AsyncSession,
+        user_id: Optional[UUID] = None,
         max_messages: Optional[int] = None
     ) -> SummarizeResponse:
         """Summarize a conversation using direct model calls (no graph needed).
         Uses the agent system prompt in journal mode for persona-style summarization.
+        Long conversations are condensed chunk by chunk first (map-reduce), so the
+        final journal prompt stays bounded regardless of conversation length.
+        With a thread_id, notes are stored per thread and only new messages are
+        summarized on later calls.
         """
         try:
             from datetime import datetime
@@ -133,19 +190,29 @@ class ChatService:
             construct_data = await construct_repository.get_construct(
                 request.construct_id, db
             )
+            await release_connection(db)
 
 
             messages_to_summarize = request.messages
-            if max_messages and len(request.messages) > max_messages:
-                messages_to_summarize = request.messages[-max_messages:]
-                logger.info(f"Limiting summarization to most recent {max_messages} messages out of {len(request.messages)} total")
+            conversation_lines = self._format_conversation_lines(messages_to_summarize)
+            use_chunked = request.chunked
+            if use_chunked is None:
+                use_chunked = count_text_tokens("\n".join(conversation_lines)) > settings.summary_chunk_tokens
 
-          
-            conversation_text = "\n".join([
-                f"{msg.role.upper()}: {msg.content}"
-                for msg in messages_to_summarize
-                if msg.role in ["user", "assistant"]
-            ])
+            if request.thread_id and user_id:
+                notes = await self._incremental_thread_notes(
+                    db, user_id, request.thread_id, model, conversation_lines
+                )
+                conversation_text = "Your notes from the conversation, in order:\n" + notes
+            elif use_chunked:
+                notes = await self._map_reduce_conversation(model, conversation_lines, user_id)
+                conversation_text = "Your notes from the conversation, in order:\n" + notes
+                logger.info(f"Condensed {len(messages_to_summarize)} messages with chunked summarization")
+            else:
+                if max_messages and len(request.messages) > max_messages:
+                    messages_to_summarize = request.messages[-max_messages:]
+                    logger.info(f"Limiting summarization to most recent {max_messages} messages out of {len(request.messages)} total")
+                conversation_text = self._format_conversation_text(messages_to_summarize)
 
  
             now = datetime.now()
@@ -182,7 +249,10 @@ class ChatService:
                 HumanMessage(content=user_prompt)
             ]
 
-            response = await model.ainvoke(messages)
+            async with admission_control_service.slot(
+                self._model_name(model), Priority.BACKGROUND, user_id
+            ):
+                response = await model.ainvoke(messages)
             summary = response.content
 
             logger.info(f"Successfully generated journal mode summary for {len(messages_to_summarize)} messages")
@@ -192,10 +262,184 @@ class ChatService:
                 message_count=len(messages_to_summarize),
                 timestamp=now.isoformat()
             )
+        except AdmissionRejectedError:
+            raise
         except Exception as e:
             logger.error(f"Error summarizing conversation: {e}")
             raise Exception(f"Failed to summarize conversation: {e}")
 
+    async def summarize_messages(
+        self,
+        messages: List[BaseMessage],
+        previous_summary: Optional[str] = None,
+        user_id: Optional[UUID] = None
+    ) -> str:
+        """Fold conversation messages into a rolling summary (used off the request path)."""
+        model = model_service.get_model()
+        if not model:
+            raise RuntimeError("No model available. Please check Ollama is running.")
+        
+        return await self._summarize_text(
+            model, self._format_conversation_text(messages), previous_summary, user_id
+        )
+
+    async def _incremental_thread_notes(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        thread_id: str,
+        model,
+        conversation_lines: List[str]
+    ) -> str:
+        """
+        Return notes for the whole conversation, summarizing only messages past
+        the stored watermark.
+        
+        The stored checkpoint is reused when the first message_count messages
+        still hash to prefix_hash; an edited or different history starts over.
+        """
+        stored = await get_conversation_summary(db, user_id, thread_id)
+        # Read before the model calls; the upsert below checks out a new connection
+        await release_connection(db)
+        start, notes = 0, None
+        if (
+            stored
+            and stored.message_count <= len(conversation_lines)
+            and self._hash_conversation_lines(conversation_lines[:stored.message_count]) == stored.prefix_hash
+        ):
+            start, notes = stored.message_count, stored.notes
+        elif stored:
+            logger.info(f"Summary watermark for thread {thread_id} no longer matches, re-summarizing")
+
+        new_lines = conversation_lines[start:]
+        if not new_lines:
+            return notes or ""
+
+        if count_text_tokens("\n".join(new_lines)) > settings.summary_chunk_tokens:
+            new_text = await self._map_reduce_conversation(model, new_lines, user_id)
+        else:
+            new_text = "\n".join(new_lines)
+        notes = await self._summarize_text(model, new_text, notes, user_id)
+        logger.info(f"Summarized {len(new_lines)} new messages for thread {thread_id} (watermark {start})")
+
+        try:
+            await upsert_conversation_summary(
+                db,
+                user_id=user_id,
+                thread_id=thread_id,
+                message_count=len(conversation_lines),
+                prefix_hash=self._hash_conversation_lines(conversation_lines),
+                notes=notes
+            )
+        except Exception as e:
+            logger.warning(f"Could not store summary checkpoint for thread {thread_id}: {e}")
+        return notes
+
+    @staticmethod
+    def _hash_conversation_lines(conversation_lines: List[str]) -> str:
+        digest = hashlib.sha256()
+        for line in conversation_lines:
+            digest.update(line.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def _map_reduce_conversation(
+        self,
+        model,
+        conversation_lines: List[str],
+        user_id: Optional[UUID] = None
+    ) -> str:
+        """
+        Condense a long conversation into ordered notes that fit one chunk.
+        
+        Map: split the conversation by token count and summarize chunks concurrently.
+        Reduce: merge neighbouring partial summaries until the notes fit one chunk.
+        """
+        chunk_tokens = settings.summary_chunk_tokens
+        chunks = chunk_texts_by_tokens(conversation_lines, chunk_tokens)
+        partials = await self._summarize_concurrently(
+            model, ["\n".join(chunk) for chunk in chunks], user_id
+        )
+        logger.debug(f"Summarized {len(chunks)} conversation chunks")
+
+        while len(partials) > 1 and count_text_tokens("\n\n".join(partials)) > chunk_tokens:
+            groups = chunk_texts_by_tokens(partials, chunk_tokens)
+            if len(groups) == len(partials):
+                # Every partial is large on its own: merge pairwise to guarantee progress
+                groups = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+            partials = await self._summarize_concurrently(
+                model, ["\n\n".join(group) for group in groups], user_id
+            )
+            logger.debug(f"Reduced conversation notes to {len(partials)} partial summaries")
+
+        return "\n\n".join(partials)
+
+    async def _summarize_concurrently(
+        self,
+        model,
+        texts: List[str],
+        user_id: Optional[UUID] = None
+    ) -> List[str]:
+        """
+        Summarize texts concurrently, in order.
+        
+        At most the model's background slot share is requested at once, so
+        one long conversation neither fills the admission queue with its
+        chunks nor leaves them queued as preemption victims.
+        """
+        in_flight = asyncio.Semaphore(
+            admission_control_service.limit(self._model_name(model), Priority.BACKGROUND)
+        )
+
+        async def summarize(text: str) -> str:
+            async with in_flight:
+                return await self._summarize_text(model, text, user_id=user_id)
+
+        return list(await asyncio.gather(*[summarize(text) for text in texts]))
+
+    async def _summarize_text(
+        self,
+        model,
+        conversation_text: str,
+        previous_summary: Optional[str] = None,
+        user_id: Optional[UUID] = None
+    ) -> str:
+        """Run one neutral summary request in its own background generation slot."""
+        prompt = prompt_template_service.render_template(
+            "prompts/rolling_summary.j2",
+            previous_summary=previous_summary,
+            conversation_text=conversation_text,
+            max_words=settings.rolling_summary_max_words
+        )
+        
+        from langchain_core.messages import HumanMessage
+        async with admission_control_service.slot(
+            self._model_name(model), Priority.BACKGROUND, user_id
+        ):
+            response = await model.ainvoke([HumanMessage(content=prompt)])
+        return response.content.strip()
+
+    @staticmethod
+    def _model_name(model) -> str:
+        """Admission control key of a chat model."""
+        return getattr(model, "model", "default")
+
+    @staticmethod
+    def _format_conversation_lines(messages: List[Any]) -> List[str]:
+        """Render user/assistant turns as text lines, from ChatMessage or LangChain messages."""
+        roles = {"human": "user", "ai": "assistant"}
+        lines = []
+        for msg in messages:
+            role = getattr(msg, "role", None) or roles.get(getattr(msg, "type", ""), "")
+            if role in ["user", "assistant"]:
+                lines.append(f"{role.upper()}: {msg.content}")
+        return lines
+
+    @classmethod
+    def _format_conversation_text(cls, messages: List[Any]) -> str:
+        """Render user/assistant turns as plain text."""
+        return "\n".join(cls._format_conversation_lines(messages))
+
     def is_available(self) -> bool:
         """Check if the chat service is available."""
         return self.graph is not None
@@ -0,0 +1,8 @@
+"""
+LangGraph checkpoint savers used by the chat graph.
+"""
+
+from .bounded_memory_saver import BoundedMemorySaver
+from .postgres_saver import PostgresCheckpointSaver
+
+__all__ = ["BoundedMemorySaver", "PostgresCheckpointSaver"]
@@ -0,0 +1,463 @@
+"""
+Bounded in-memory LangGraph checkpointer.
+Keeps hot threads in process memory and spills cold threads to a compressed
+SQLite file, rehydrating them transparently the next time they are read.
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class SpillStore:
+    """SQLite store holding zlib-compressed snapshots of evicted threads."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spilled_threads ("
+            "thread_id TEXT PRIMARY KEY, payload BLOB NOT NULL, spilled_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def save(self, thread_id: str, snapshot: Dict[str, Any]) -> int:
+        """Store a thread snapshot. Returns the compressed size in bytes."""
+        payload = zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO spilled_threads (thread_id, payload, spilled_at) VALUES (?, ?, ?)",
+                (thread_id, payload, time.time())
+            )
+            self._conn.commit()
+        return len(payload)
+    
+    def pop(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Load and remove a thread snapshot, if present."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM spilled_threads WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("DELETE FROM spilled_threads WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+        return pickle.loads(zlib.decompress(row[0]))
+    
+    def delete(self, thread_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM spilled_threads WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM spilled_threads")
+            self._conn.commit()
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM spilled_threads").fetchone()[0]
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    InMemorySaver with LRU / size / idle-TTL eviction of whole threads.
+    
+    Evicted threads are written to a SpillStore when a spill path is configured
+    (otherwise they are dropped) and restored on the next read or write for that
+    thread_id, so graph.aget_state keeps working for cold conversations.
+    
+    Eviction only queues a snapshot in memory. The async API, which the chat
+    graph uses, writes queued snapshots and loads spilled threads in a worker
+    thread, so spill I/O and (de)compression never block the event loop. A
+    queued snapshot is rehydrated from memory if its thread is needed again
+    before it has been written.
+    """
+    
+    def __init__(
+        self,
+        *,
+        max_threads: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        spill_path: Optional[str] = None,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.logger = logging.getLogger(__name__)
+        self.max_threads = max_threads
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.spill_store = SpillStore(spill_path) if spill_path else None
+        
+        # thread_id -> last access time, least recently used first
+        self._access: "OrderedDict[str, float]" = OrderedDict()
+        self._sizes: Dict[str, int] = defaultdict(int)
+        self._write_keys: Dict[str, Set[Tuple[str, str, str]]] = defaultdict(set)
+        self._blob_keys: Dict[str, Set[Tuple[str, str, str, Any]]] = defaultdict(set)
+        # Evicted thread snapshots not yet written to the spill store
+        self._pending_spills: Dict[str, Dict[str, Any]] = {}
+        # Orders spill writes, loads and deletes issued from the async API
+        self._spill_lock: Optional[asyncio.Lock] = None
+        # Threads whose snapshots a worker thread is writing, and those deleted meanwhile
+        self._writing: Set[str] = set()
+        self._deleted_while_writing: Set[str] = set()
+        
+        self.evictions = 0
+        self.expirations = 0
+        self.spills = 0
+        self.rehydrations = 0
+    
+    # ---- LangGraph checkpointer API -------------------------------------
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        resident = self._touch(thread_id)
+        self._flush_spills()
+        if not resident:
+            return None
+        return super().get_tuple(config)
+    
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config:
+            resident = self._touch(config["configurable"]["thread_id"])
+            self._flush_spills()
+            if not resident:
+                return
+        yield from super().list(config, filter=filter, before=before, limit=limit)
+    
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        self._touch(config["configurable"]["thread_id"], create=True)
+        result = self._put(config, checkpoint, metadata, new_versions)
+        self._flush_spills()
+        return result
+    
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._touch(config["configurable"]["thread_id"], create=True)
+        self._put_writes(config, writes, task_id, task_path)
+        self._flush_spills()
+    
+    def delete_thread(self, thread_id: str) -> None:
+        self._drop_from_memory(thread_id)
+        self._pending_spills.pop(thread_id, None)
+        if thread_id in self._writing:
+            self._deleted_while_writing.add(thread_id)
+        if self.spill_store:
+            self.spill_store.delete(thread_id)
+    
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        # Read before flushing: the thread may be evicted while the flush awaits
+        result = InMemorySaver.get_tuple(self, config) if await self._atouch(thread_id) else None
+        await self._aflush_spills()
+        return result
+    
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items: List[CheckpointTuple] = []
+        if not config or await self._atouch(config["configurable"]["thread_id"]):
+            items = list(InMemorySaver.list(self, config, filter=filter, before=before, limit=limit))
+        await self._aflush_spills()
+        for item in items:
+            yield item
+    
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        await self._atouch(config["configurable"]["thread_id"], create=True)
+        result = self._put(config, checkpoint, metadata, new_versions)
+        await self._aflush_spills()
+        return result
+    
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._atouch(config["configurable"]["thread_id"], create=True)
+        self._put_writes(config, writes, task_id, task_path)
+        await self._aflush_spills()
+    
+    async def adelete_thread(self, thread_id: str) -> None:
+        self._drop_from_memory(thread_id)
+        self._pending_spills.pop(thread_id, None)
+        if self.spill_store:
+            async with self._get_spill_lock():
+                await asyncio.to_thread(self.spill_store.delete, thread_id)
+    
+    # ---- Bookkeeping ----------------------------------------------------
+    
+    def clear(self) -> None:
+        """Drop every thread from memory and from the spill store."""
+        self.storage.clear()
+        self.writes.clear()
+        self.blobs.clear()
+        self._access.clear()
+        self._sizes.clear()
+        self._write_keys.clear()
+        self._blob_keys.clear()
+        self._pending_spills.clear()
+        self._deleted_while_writing.update(self._writing)
+        if self.spill_store:
+            self.spill_store.clear()
+    
+    def has_thread(self, thread_id: str) -> bool:
+        """Check whether a thread is resident in memory."""
+        return thread_id in self._access
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return residency and eviction counters."""
+        return {
+            "threads": len(self._access),
+            "bytes": sum(self._sizes.values()),
+            "max_threads": self.max_threads,
+            "max_bytes": self.max_bytes,
+            "idle_ttl": self.idle_ttl,
+            "spilled_threads": self.spill_store.count() if self.spill_store else 0,
+            "pending_spills": len(self._pending_spills),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "spills": self.spills,
+            "rehydrations": self.rehydrations,
+        }
+    
+    def _put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint in memory and account for its size (thread already touched)."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        result = super().put(config, checkpoint, metadata, new_versions)
+        
+        checkpoint_b, metadata_b, _ = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+        size = len(checkpoint_b[1]) + len(metadata_b[1])
+        for channel, version in new_versions.items():
+            key = (thread_id, checkpoint_ns, channel, version)
+            self._blob_keys[thread_id].add(key)
+            size += len(self.blobs[key][1])
+        self._sizes[thread_id] += size
+        
+        self._enforce_limits(keep=thread_id)
+        return result
+    
+    def _put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store pending writes in memory and account for their size (thread already touched)."""
+        thread_id = config["configurable"]["thread_id"]
+        outer_key = (thread_id, config["configurable"].get("checkpoint_ns", ""), config["configurable"]["checkpoint_id"])
+        before = sum(len(w[2][1]) for w in self.writes.get(outer_key, {}).values())
+        super().put_writes(config, writes, task_id, task_path)
+        after = sum(len(w[2][1]) for w in self.writes.get(outer_key, {}).values())
+        
+        self._write_keys[thread_id].add(outer_key)
+        self._sizes[thread_id] += after - before
+        self._enforce_limits(keep=thread_id)
+    
+    def _touch(self, thread_id: str, create: bool = False) -> bool:
+        """
+        Mark a thread as recently used, rehydrating it from the spill store if needed.
+        
+        Returns:
+            True if the thread is (now) resident in memory
+        """
+        rehydrated = False
+        if thread_id not in self._access:
+            snapshot = self._pending_spills.pop(thread_id, None)
+            if snapshot is None and self.spill_store:
+                snapshot = self.spill_store.pop(thread_id)
+            rehydrated = self._rehydrate(thread_id, snapshot)
+            if not rehydrated and not create:
+                return False
+        return self._mark_used(thread_id, rehydrated)
+    
+    async def _atouch(self, thread_id: str, create: bool = False) -> bool:
+        """_touch for the async API: spilled threads are loaded in a worker thread."""
+        rehydrated = False
+        if thread_id not in self._access:
+            snapshot = self._pending_spills.pop(thread_id, None)
+            if snapshot is None and self.spill_store:
+                async with self._get_spill_lock():
+                    # Another task may have loaded (or re-evicted) the thread meanwhile
+                    if thread_id in self._access:
+                        return self._mark_used(thread_id, False)
+                    snapshot = self._pending_spills.pop(thread_id, None)
+                    if snapshot is None:
+                        snapshot = await asyncio.to_thread(self.spill_store.pop, thread_id)
+            rehydrated = self._rehydrate(thread_id, snapshot)
+            if not rehydrated and not create:
+                return False
+        return self._mark_used(thread_id, rehydrated)
+    
+    def _mark_used(self, thread_id: str, rehydrated: bool) -> bool:
+        self._access[thread_id] = time.monotonic()
+        self._access.move_to_end(thread_id)
+        if rehydrated:
+            self._enforce_limits(keep=thread_id)
+        return True
+    
+    def _rehydrate(self, thread_id: str, snapshot: Optional[Dict[str, Any]]) -> bool:
+        """Install a spilled snapshot in memory. Returns False if there is none."""
+        if snapshot is None:
+            return False
+        
+        for checkpoint_ns, checkpoints in snapshot["storage"].items():
+            self.storage[thread_id][checkpoint_ns].update(checkpoints)
+        self.writes.update({key: dict(value) for key, value in snapshot["writes"].items()})
+        self.blobs.update(snapshot["blobs"])
+        self._write_keys[thread_id] = set(snapshot["writes"])
+        self._blob_keys[thread_id] = set(snapshot["blobs"])
+        self._sizes[thread_id] = snapshot["size"]
+        self.rehydrations += 1
+        self.logger.debug(f"Rehydrated thread {thread_id} from spill store")
+        return True
+    
+    def _enforce_limits(self, keep: Optional[str] = None) -> None:
+        """Evict idle threads, then least recently used ones until within limits."""
+        if self.idle_ttl is not None:
+            cutoff = time.monotonic() - self.idle_ttl
+            for thread_id, last_access in list(self._access.items()):
+                if last_access > cutoff:
+                    break
+                if thread_id != keep:
+                    self._evict(thread_id)
+                    self.expirations += 1
+        
+        for thread_id in list(self._access):
+            if not self._over_limits():
+                break
+            if thread_id != keep:
+                self._evict(thread_id)
+    
+    def _over_limits(self) -> bool:
+        if self.max_threads is not None and len(self._access) > self.max_threads:
+            return True
+        if self.max_bytes is not None and sum(self._sizes.values()) > self.max_bytes:
+            return True
+        return False
+    
+    def _evict(self, thread_id: str) -> None:
+        """Drop a thread from memory, queueing its snapshot for the spill store."""
+        if self.spill_store:
+            # Copy the per-thread containers so a queued snapshot never changes while it is written
+            self._pending_spills[thread_id] = {
+                "storage": {ns: dict(checkpoints) for ns, checkpoints in self.storage.get(thread_id, {}).items()},
+                "writes": {k: dict(self.writes[k]) for k in self._write_keys.get(thread_id, ()) if k in self.writes},
+                "blobs": {k: self.blobs[k] for k in self._blob_keys.get(thread_id, ()) if k in self.blobs},
+                "size": self._sizes.get(thread_id, 0),
+            }
+        
+        self._drop_from_memory(thread_id)
+        self.evictions += 1
+        self.logger.debug(f"Evicted thread {thread_id} from memory")
+    
+    def _write_spills(self, spills: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for thread_id, snapshot in spills:
+            self.spill_store.save(thread_id, snapshot)
+    
+    def _finish_spills(self, spills: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Unqueue written snapshots, unless the thread was evicted again meanwhile."""
+        for thread_id, snapshot in spills:
+            if self._pending_spills.get(thread_id) is snapshot:
+                del self._pending_spills[thread_id]
+            self.spills += 1
+    
+    def _flush_spills(self) -> None:
+        """Write queued snapshots to the spill store (sync API)."""
+        spills = list(self._pending_spills.items())
+        if spills:
+            self._write_spills(spills)
+            self._finish_spills(spills)
+    
+    async def _aflush_spills(self) -> None:
+        """Write queued snapshots to the spill store in a worker thread (async API)."""
+        if not self._pending_spills:
+            return
+        async with self._get_spill_lock():
+            spills = list(self._pending_spills.items())
+            if not spills:
+                return
+            self._writing = {thread_id for thread_id, _ in spills}
+            try:
+                await asyncio.to_thread(self._write_spills, spills)
+            finally:
+                self._writing = set()
+            self._finish_spills(spills)
+            
+            # A sync delete_thread/clear during the write must not be undone by it
+            deleted, self._deleted_while_writing = self._deleted_while_writing, set()
+            for thread_id in deleted:
+                await asyncio.to_thread(self.spill_store.delete, thread_id)
+    
+    def _get_spill_lock(self) -> asyncio.Lock:
+        if self._spill_lock is None:
+            self._spill_lock = asyncio.Lock()
+        return self._spill_lock
+    
+    def _drop_from_memory(self, thread_id: str) -> None:
+        self.storage.pop(thread_id, None)
+        for key in self._write_keys.pop(thread_id, ()):
+            self.writes.pop(key, None)
+        for key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        self._access.pop(thread_id, None)
+        self._sizes.pop(thread_id, None)
@@ -0,0 +1,291 @@
+"""
+Postgres-backed LangGraph checkpointer.
+Persists chat graph checkpoints through the application's SQLAlchemy async engine,
+so conversation history survives restarts and is shared between workers.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.types import TASKS
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.checkpoint import GraphCheckpoint, GraphCheckpointWrite
+
+
+WriteKey = Tuple[str, str, str]
+
+
+class PostgresCheckpointSaver(BaseCheckpointSaver[int]):
+    """
+    Async checkpoint saver storing checkpoints and pending writes in Postgres.
+    
+    Uses the shared SQLAlchemy engine, so checkpoint traffic draws from the same
+    connection pool as the ORM. Each checkpoint is a single upsert and all writes
+    of a task are flushed in one multi-row INSERT.
+    """
+    
+    def __init__(self, engine: AsyncEngine, *, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde)
+        self.engine = engine
+        self.logger = logging.getLogger(__name__)
+    
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get the requested (or latest) checkpoint for a thread."""
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        
+        query = select(GraphCheckpoint).where(
+            GraphCheckpoint.thread_id == thread_id,
+            GraphCheckpoint.checkpoint_ns == checkpoint_ns
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(GraphCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(GraphCheckpoint.checkpoint_id.desc()).limit(1)
+        
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(query)).first()
+            if row is None:
+                return None
+            writes = await self._load_writes(conn, [row])
+        
+        return self._row_to_tuple(row, writes)
+    
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints newest first, optionally filtered by metadata."""
+        query = select(GraphCheckpoint)
+        if config:
+            query = query.where(GraphCheckpoint.thread_id == config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                query = query.where(GraphCheckpoint.checkpoint_ns == checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(GraphCheckpoint.checkpoint_id == checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            query = query.where(GraphCheckpoint.checkpoint_id < before_checkpoint_id)
+        query = query.order_by(GraphCheckpoint.checkpoint_id.desc())
+        if limit is not None and not filter:
+            query = query.limit(limit)
+        
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+            if filter:
+                rows = [
+                    row for row in rows
+                    if all(
+                        value == self._load_metadata(row).get(key)
+                        for key, value in filter.items()
+                    )
+                ]
+                if limit is not None:
+                    rows = rows[:limit]
+            writes = await self._load_writes(conn, rows)
+        
+        for row in rows:
+            yield self._row_to_tuple(row, writes)
+    
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Upsert a checkpoint and return the config pointing at it."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        
+        c = checkpoint.copy()
+        c.pop("pending_sends", None)  # type: ignore[misc]
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(c)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        
+        values = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "checkpoint_type": checkpoint_type,
+            "checkpoint_blob": checkpoint_blob,
+            "metadata_type": metadata_type,
+            "metadata_blob": metadata_blob,
+        }
+        stmt = insert(GraphCheckpoint).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["thread_id", "checkpoint_ns", "checkpoint_id"],
+            set_={
+                "checkpoint_type": stmt.excluded.checkpoint_type,
+                "checkpoint_blob": stmt.excluded.checkpoint_blob,
+                "metadata_type": stmt.excluded.metadata_type,
+                "metadata_blob": stmt.excluded.metadata_blob,
+            }
+        )
+        
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt)
+        
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+    
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store all pending writes of a task in a single multi-row INSERT."""
+        if not writes:
+            return
+        
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, value_blob = self.serde.dumps_typed(value)
+            rows.append({
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+                "channel": channel,
+                "value_type": value_type,
+                "value_blob": value_blob,
+                "task_path": task_path,
+            })
+        
+        stmt = insert(GraphCheckpointWrite).values(rows)
+        index_elements = ["thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"]
+        if all(channel in WRITES_IDX_MAP for channel, _ in writes):
+            # Special channels (errors, interrupts, ...) overwrite previous values
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={
+                    "channel": stmt.excluded.channel,
+                    "value_type": stmt.excluded.value_type,
+                    "value_blob": stmt.excluded.value_blob,
+                }
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+        
+        async with self.engine.begin() as conn:
+            await conn.execute(stmt)
+    
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes for a thread."""
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                delete(GraphCheckpointWrite).where(GraphCheckpointWrite.thread_id == thread_id)
+            )
+            await conn.execute(
+                delete(GraphCheckpoint).where(GraphCheckpoint.thread_id == thread_id)
+            )
+        self.logger.info(f"Deleted checkpoints for thread: {thread_id}")
+    
+    async def _load_writes(self, conn, rows: Sequence[Any]) -> Dict[WriteKey, List[Any]]:
+        """Load pending writes for the given checkpoints and their parents in one query."""
+        keys = set()
+        for row in rows:
+            keys.add((row.thread_id, row.checkpoint_ns, row.checkpoint_id))
+            if row.parent_checkpoint_id:
+                keys.add((row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id))
+        if not keys:
+            return {}
+        
+        result = await conn.execute(
+            select(GraphCheckpointWrite)
+            .where(
+                tuple_(
+                    GraphCheckpointWrite.thread_id,
+                    GraphCheckpointWrite.checkpoint_ns,
+                    GraphCheckpointWrite.checkpoint_id
+                ).in_(list(keys))
+            )
+            .order_by(GraphCheckpointWrite.task_id, GraphCheckpointWrite.idx)
+        )
+        
+        writes: Dict[WriteKey, List[Any]] = defaultdict(list)
+        for write in result.all():
+            writes[(write.thread_id, write.checkpoint_ns, write.checkpoint_id)].append(write)
+        return writes
+    
+    def _load_metadata(self, row: Any) -> CheckpointMetadata:
+        return self.serde.loads_typed((row.metadata_type, row.metadata_blob))
+    
+    def _row_to_tuple(self, row: Any, writes: Dict[WriteKey, List[Any]]) -> CheckpointTuple:
+        """Build a CheckpointTuple from a checkpoint row and preloaded writes."""
+        checkpoint: Checkpoint = self.serde.loads_typed((row.checkpoint_type, row.checkpoint_blob))
+        
+        sends = []
+        if row.parent_checkpoint_id:
+            parent_writes = writes.get((row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id), [])
+            sends = sorted(
+                (w for w in parent_writes if w.channel == TASKS),
+                key=lambda w: (w.task_path, w.task_id, w.idx)
+            )
+        
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "pending_sends": [
+                    self.serde.loads_typed((w.value_type, w.value_blob)) for w in sends
+                ],
+            },
+            metadata=self._load_metadata(row),
+            pending_writes=[
+                (w.task_id, w.channel, self.serde.loads_typed((w.value_type, w.value_blob)))
+                for w in writes.get((row.thread_id, row.checkpoint_ns, row.checkpoint_id), [])
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": row.thread_id,
+                        "checkpoint_ns": row.checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+        )
@@ -0,0 +1,117 @@
+"""
+Construct cache service.
+Process-wide TTL+LRU caches for construct rows, their relationship context and
+rendered system prompts, invalidated explicitly when a construct or link is written.
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from uuid import UUID
+
+from app.config.config import settings
+from app.utils.cache_utils import LRUCache
+
+
+class ConstructCacheService:
+    """Caches construct snapshots, their relationship context and the system prompts rendered from them."""
+
+    def __init__(
+        self,
+        max_constructs: int = 1024,
+        max_prompts: int = 2048,
+        ttl_seconds: Optional[float] = 300
+    ):
+        self.logger = logging.getLogger(__name__)
+        self._constructs = LRUCache(maxsize=max_constructs, ttl=ttl_seconds)
+        self._relationships = LRUCache(maxsize=max_constructs, ttl=ttl_seconds)
+        self._prompts = LRUCache(maxsize=max_prompts, ttl=ttl_seconds)
+
+    def get_construct(self, construct_id: UUID) -> Optional[Dict[str, Any]]:
+        """Get a cached construct snapshot (a plain dict of its columns)."""
+        return self._constructs.get(str(construct_id))
+
+    def set_construct(self, construct_id: UUID, construct_data: Dict[str, Any]) -> None:
+        """Cache a construct snapshot."""
+        self._constructs.set(str(construct_id), construct_data)
+
+    def get_relationships(self, construct_id: UUID) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached relationship context of a construct."""
+        return self._relationships.get(str(construct_id))
+
+    def set_relationships(self, construct_id: UUID, relationships: List[Dict[str, Any]]) -> None:
+        """Cache the relationship context of a construct."""
+        self._relationships.set(str(construct_id), relationships)
+
+    def get_or_render_prompt(
+        self,
+        construct: Any,
+        construct_id: Optional[str],
+        mode: str,
+        custom_instructions: Optional[str],
+        relationships: Optional[List[Dict[str, Any]]],
+        render: Callable[[], str]
+    ) -> str:
+        """Return the cached system prompt for these inputs, rendering it on a miss."""
+        key = self._prompt_key(construct, construct_id, mode, custom_instructions, relationships)
+        return self._prompts.get_or_set(key, render)
+
+    def invalidate(self, construct_id: UUID) -> None:
+        """Drop a construct, every prompt rendered from it and all relationship contexts."""
+        cache_id = str(construct_id)
+        self._constructs.invalidate(cache_id)
+        # Relationship contexts embed linked constructs' names, so any write may affect them
+        self._relationships.clear()
+        dropped = self._prompts.invalidate_where(lambda key: key[0] == cache_id)
+        self.logger.debug(f"Invalidated construct {cache_id} and {dropped} cached prompts")
+
+    def clear(self) -> None:
+        """Drop all cached constructs, relationship contexts and prompts."""
+        self._constructs.clear()
+        self._relationships.clear()
+        self._prompts.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics for each cache."""
+        return {
+            "constructs": self._constructs.stats(),
+            "relationships": self._relationships.stats(),
+            "prompts": self._prompts.stats()
+        }
+
+    @staticmethod
+    def _prompt_key(
+        construct: Any,
+        construct_id: Optional[str],
+        mode: str,
+        custom_instructions: Optional[str],
+        relationships: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[Hashable, ...]:
+        """Key a prompt by construct id + updated_at + mode (+ hashed instructions and relationships)."""
+        if isinstance(construct, dict):
+            cache_id, updated_at = construct.get("id"), construct.get("updated_at")
+        else:
+            cache_id, updated_at = getattr(construct, "id", None), getattr(construct, "updated_at", None)
+        instructions_hash = (
+            hashlib.sha256(custom_instructions.encode("utf-8")).hexdigest()
+            if custom_instructions else None
+        )
+        relationships_hash = (
+            hashlib.sha256(json.dumps(relationships, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            if relationships else None
+        )
+        return (
+            str(cache_id or construct_id or ""),
+            updated_at.isoformat() if updated_at else None,
+            mode,
+            instructions_hash,
+            relationships_hash
+        )
+
+
+# Global construct cache
+construct_cache_service = ConstructCacheService(
+    max_constructs=settings.construct_cache_size,
+    max_prompts=settings.prompt_cache_size,
+    ttl_seconds=settings.construct_cache_ttl_seconds
+)
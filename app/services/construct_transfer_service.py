@@ -0,0 +1,166 @@
+"""
+Construct transfer service.
+Streams a user's constructs, links and fragments as NDJSON and imports them
+back in batched upserts, keeping memory flat regardless of dataset size.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app.config.config import settings
+from app.crud import construct as construct_crud
+from app.crud import construct_link as link_crud
+from app.db.database import AsyncSessionLocal
+from app.schemas.construct_transfer_models import (
+    ConstructImportResponse,
+    ImportLineError,
+    transfer_record_adapter
+)
+from app.services.cache_invalidation_service import notify_all_constructs_changed
+from app.services.construct_cache_service import construct_cache_service
+from app.services.relationship_graph_service import relationship_graph_service
+
+# Record types in dependency order: links need constructs, fragments need links
+RECORD_TYPES = ("construct", "link", "fragment")
+MAX_REPORTED_ERRORS = 100
+
+
+class ConstructTransferService:
+    """NDJSON export and batched import of a user's construct graph."""
+
+    def __init__(self, batch_size: int = 500):
+        self.logger = logging.getLogger(__name__)
+        self.batch_size = batch_size
+
+    async def export_ndjson(self, user_id: UUID) -> AsyncIterator[bytes]:
+        """
+        Yield the user's constructs, then links, then fragments, one JSON object per line.
+
+        Uses its own session because the response body is streamed after the
+        request's dependencies have been closed.
+        """
+        streams = (
+            ("construct", construct_crud.stream_constructs_by_creator),
+            ("link", link_crud.stream_links_by_creator),
+            ("fragment", link_crud.stream_fragments_by_creator),
+        )
+        async with AsyncSessionLocal() as db:
+            for record_type, stream in streams:
+                rows = await stream(db, user_id, self.batch_size)
+                async for row in rows:
+                    record = {"type": record_type, **row}
+                    yield (json.dumps(record, default=str) + "\n").encode("utf-8")
+
+    async def import_ndjson(
+        self,
+        chunks: AsyncIterator[bytes],
+        user_id: UUID
+    ) -> ConstructImportResponse:
+        """
+        Import NDJSON records streamed from the request body.
+
+        Records are upserted in batches of batch_size per type and committed
+        per batch. Imported constructs always belong to user_id; records that
+        would touch another user's data are skipped. Malformed lines are
+        reported and skipped.
+        """
+        summary = ConstructImportResponse()
+        pending: Dict[str, List[Dict[str, Any]]] = {record_type: [] for record_type in RECORD_TYPES}
+        received = 0
+
+        async with AsyncSessionLocal() as db:
+            line_number = 0
+            async for line in self._iter_lines(chunks):
+                line_number += 1
+                if not line.strip():
+                    continue
+                try:
+                    record = transfer_record_adapter.validate_json(line)
+                except ValidationError as e:
+                    summary.skipped += 1
+                    if len(summary.errors) < MAX_REPORTED_ERRORS:
+                        summary.errors.append(ImportLineError(
+                            line=line_number, error=e.errors()[0]["msg"]
+                        ))
+                    continue
+
+                received += 1
+                pending[record.type].append(self._to_row(record))
+                if len(pending[record.type]) >= self.batch_size:
+                    await self._flush(db, user_id, pending, summary)
+
+            await self._flush(db, user_id, pending, summary)
+
+            summary.skipped += received - (summary.constructs + summary.links + summary.fragments)
+            if received:
+                await notify_all_constructs_changed(db)
+                await db.commit()
+
+        if received:
+            construct_cache_service.clear()
+            relationship_graph_service.invalidate_user(user_id)
+        self.logger.info(
+            f"Imported {summary.constructs} constructs, {summary.links} links and "
+            f"{summary.fragments} fragments for user {user_id} ({summary.skipped} skipped)"
+        )
+        return summary
+
+    async def _flush(
+        self,
+        db,
+        user_id: UUID,
+        pending: Dict[str, List[Dict[str, Any]]],
+        summary: ConstructImportResponse
+    ) -> None:
+        """Upsert every pending batch in dependency order and commit."""
+        try:
+            summary.constructs += await construct_crud.upsert_constructs(
+                db, user_id, self._dedupe(pending["construct"])
+            )
+            summary.links += await link_crud.upsert_links(
+                db, user_id, self._dedupe(pending["link"])
+            )
+            summary.fragments += await link_crud.upsert_fragments(
+                db, user_id, self._dedupe(pending["fragment"])
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            for batch in pending.values():
+                batch.clear()
+
+    @staticmethod
+    def _dedupe(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the last row per id; ON CONFLICT cannot touch a row twice in one statement."""
+        return list({row["id"]: row for row in rows}.values())
+
+    @staticmethod
+    def _to_row(record) -> Dict[str, Any]:
+        """Column values for a record, with timestamps defaulting to now."""
+        now = datetime.now(timezone.utc)
+        row = record.model_dump(exclude={"type"})
+        row["created_at"] = row["created_at"] or now
+        row["updated_at"] = row["updated_at"] or now
+        return row
+
+    @staticmethod
+    async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Split a byte stream into lines without buffering the whole body."""
+        buffer = b""
+        async for chunk in chunks:
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line
+        if buffer:
+            yield buffer
+
+
+# Global construct transfer service
+construct_transfer_service = ConstructTransferService(batch_size=settings.bulk_transfer_batch_size)
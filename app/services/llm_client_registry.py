@@ -0,0 +1,103 @@
+"""
+LLM client registry.
+Keeps a bounded set of ready-to-use ChatOllama chains keyed by hashed LLMConfig,
+all sharing one pooled HTTP transport per Ollama base URL so warm keep-alive
+connections are reused across chat turns.
+"""
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+
+import httpx
+from langchain_ollama import ChatOllama
+from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from app.config.config import settings
+from app.utils.cache_utils import LRUCache
+
+if TYPE_CHECKING:
+    from app.services.llm_config_service import LLMConfig
+
+
+class LLMClientRegistry:
+    """Bounded LRU registry of LLM chains with shared HTTP connection pools."""
+    
+    def __init__(
+        self,
+        max_clients: int = 32,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10
+    ):
+        self.logger = logging.getLogger(__name__)
+        self._chains = LRUCache(maxsize=max_clients)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._transports: Dict[str, Tuple[httpx.HTTPTransport, httpx.AsyncHTTPTransport]] = {}
+        self._transport_lock = threading.Lock()
+    
+    def _get_transports(self, base_url: str) -> Tuple[httpx.HTTPTransport, httpx.AsyncHTTPTransport]:
+        """Get the shared (sync, async) transports for an Ollama base URL."""
+        with self._transport_lock:
+            if base_url not in self._transports:
+                self._transports[base_url] = (
+                    httpx.HTTPTransport(limits=self._limits),
+                    httpx.AsyncHTTPTransport(limits=self._limits)
+                )
+                self.logger.info(f"Created pooled HTTP transport for {base_url}")
+            return self._transports[base_url]
+    
+    def create_llm(self, config: "LLMConfig") -> ChatOllama:
+        """Create a ChatOllama instance bound to the shared transport for its base URL."""
+        sync_transport, async_transport = self._get_transports(config.base_url)
+        return ChatOllama(
+            model=config.model_name,
+            base_url=config.base_url,
+            sync_client_kwargs={"transport": sync_transport},
+            async_client_kwargs={"transport": async_transport},
+            **config.to_model_kwargs()
+        )
+    
+    def get_chain(self, config: "LLMConfig", system_message: str):
+        """
+        Get a cached (prompt_template | llm) chain for a config and system message.
+        
+        Args:
+            config: Validated LLM configuration
+            system_message: System message for the prompt template
+        
+        Returns:
+            LangChain LLM chain (prompt_template | llm)
+        """
+        system_hash = hashlib.sha256(system_message.encode("utf-8")).hexdigest()
+        key = (config.cache_key(), system_hash)
+        
+        def build_chain():
+            self.logger.debug(f"Creating LLM chain for model {config.model_name}")
+            prompt_template = ChatPromptTemplate.from_messages([
+                ("system", system_message),
+                MessagesPlaceholder("messages")
+            ])
+            return prompt_template | self.create_llm(config)
+        
+        return self._chains.get_or_set(key, build_chain)
+    
+    def clear(self) -> None:
+        """Drop all cached chains (pooled transports are kept)."""
+        self._chains.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and the number of pooled transports."""
+        stats = self._chains.stats()
+        stats["pooled_hosts"] = len(self._transports)
+        return stats
+
+
+# Global registry instance
+llm_client_registry = LLMClientRegistry(
+    max_clients=settings.llm_client_cache_size,
+    max_connections=settings.ollama_max_connections,
+    max_keepalive_connections=settings.ollama_max_keepalive_connections
+)
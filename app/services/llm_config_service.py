@@ -3,10 +3,12 @@ Centralized LLM configuration service.
 Provides unified temperature management, model configuration, mode-aware settings,
 and LLM chain creation. Eliminates duplication across chat nodes and graph services.
 """
+import hashlib
+import json
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
-from langchain_ollama import ChatOllama
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from dataclasses import dataclass, asdict
+
+from app.services.llm_client_registry import llm_client_registry
 
 
 @dataclass
@@ -18,6 +20,7 @@ class LLMConfig:
     repeat_penalty: Optional[float] = None
     presence_penalty: Optional[float] = None
     frequency_penalty: Optional[float] = None
+    num_ctx: Optional[int] = None
     base_url: str = "http://localhost:11434"
 
     def to_model_kwargs(self) -> Dict[str, Any]:
@@ -32,9 +35,16 @@ class LLMConfig:
             kwargs["presence_penalty"] = self.presence_penalty
         if self.frequency_penalty is not None:
             kwargs["frequency_penalty"] = self.frequency_penalty
+        if self.num_ctx is not None:
+            kwargs["num_ctx"] = self.num_ctx
             
         return kwargs
 
+    def cache_key(self) -> str:
+        """Stable hash of model, base_url and sampling settings for client reuse."""
+        payload = json.dumps(asdict(self), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 class LLMConfigService:
     """Centralized service for LLM configuration management."""
     
@@ -57,6 +67,19 @@ class LLMConfigService:
         "silent": {"max_temperature": 0.1}
     }
     
+    # Model-specific context windows (tokens), also sent to Ollama as num_ctx
+    MODEL_CONTEXT_WINDOWS = {
+        "gemma3:27b": 8192,
+        "llama4": 8192,
+        "llama3.1": 8192,
+        "llama3-groq-tool-use": 8192,
+        "devstral:latest": 8192
+    }
+    DEFAULT_CONTEXT_WINDOW = 4096
+    
+    # Tokens reserved for the reply when the request sets no max_tokens
+    DEFAULT_REPLY_TOKENS = 1024
+    
 
     @classmethod
     def create_basic_config(
@@ -79,6 +102,7 @@ class LLMConfigService:
             LLMConfig instance
         """
         final_temperature = temperature or cls.get_mode_temperature(mode)
+        kwargs.setdefault("num_ctx", cls.get_context_window(model_name))
         
         return LLMConfig(
             model_name=model_name,
@@ -86,6 +110,27 @@ class LLMConfigService:
             **kwargs
         )
     
+    @classmethod
+    def get_context_window(cls, model_name: str) -> int:
+        """Get the context window size (tokens) for a model."""
+        return cls.MODEL_CONTEXT_WINDOWS.get(model_name, cls.DEFAULT_CONTEXT_WINDOW)
+    
+    @classmethod
+    def get_context_budget(cls, model_name: str, max_tokens: Optional[int] = None) -> int:
+        """
+        Get the prompt token budget for a model after reserving room for the reply.
+        
+        Args:
+            model_name: Model to use
+            max_tokens: Requested reply length (defaults to DEFAULT_REPLY_TOKENS)
+            
+        Returns:
+            Tokens available for system prompt + history
+        """
+        window = cls.get_context_window(model_name)
+        reply_tokens = max_tokens or cls.DEFAULT_REPLY_TOKENS
+        return max(window - reply_tokens, window // 4)
+    
     @classmethod
     def get_streaming_config(cls, mode: str) -> Dict[str, Any]:
         """Get streaming-specific configuration for a mode."""
@@ -142,7 +187,8 @@ class LLMConfigService:
             **model_kwargs: Additional model parameters (fallback)
         
         Returns:
-            LangChain LLM chain (prompt_template | llm)
+            LangChain LLM chain (prompt_template | llm), shared across calls
+            with the same configuration
         """
         # Use provided config or create a basic one
         if config:
@@ -160,21 +206,8 @@ class LLMConfigService:
                 **model_kwargs
             )
         
-        # Create the LLM instance
-        llm = ChatOllama(
-            model=final_config.model_name,
-            base_url=final_config.base_url,
-            **final_config.to_model_kwargs()
-        )
-        
-        # Create the prompt template
-        prompt_template = ChatPromptTemplate.from_messages([
-            ("system", system_message),
-            MessagesPlaceholder("messages")
-        ])
-        
-        # Return the chain (prompt | llm)
-        return prompt_template | llm
+        # Reuse a pooled client/chain for this configuration
+        return llm_client_registry.get_chain(final_config, system_message)
 
 # Global config service instance
 llm_config_service = LLMConfigService()
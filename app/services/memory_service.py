@@ -4,33 +4,70 @@ Handles memory operations separately from chat processing.
 """
 
 import logging
-from typing import Optional
-from langgraph.checkpoint.memory import MemorySaver
+from typing import Any, Dict, Optional
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from app.config.config import settings
+from app.services.checkpointers import BoundedMemorySaver, PostgresCheckpointSaver
 
 
 class MemoryService:
     """Service for managing chat conversation memory."""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
         self.logger = logging.getLogger(__name__)
-        self.memory_saver = MemorySaver()
+        self.backend = (backend or settings.checkpointer_backend).lower()
+        self.memory_saver = self._create_checkpointer()
+    
+    def _create_checkpointer(self) -> BaseCheckpointSaver:
+        """Create the checkpointer for the configured backend."""
+        if self.backend == "postgres":
+            from app.db.database import engine
+            
+            self.logger.info("Using Postgres checkpointer")
+            return PostgresCheckpointSaver(engine)
+        
+        if self.backend != "memory":
+            self.logger.warning(f"Unknown checkpointer backend '{self.backend}', falling back to memory")
+        return BoundedMemorySaver(
+            max_threads=settings.checkpoint_max_threads,
+            max_bytes=settings.checkpoint_max_bytes,
+            idle_ttl=settings.checkpoint_idle_ttl_seconds,
+            spill_path=settings.checkpoint_spill_path
+        )
     
-    def get_memory_saver(self) -> MemorySaver:
+    def get_memory_saver(self) -> BaseCheckpointSaver:
         """Get the memory saver instance."""
         return self.memory_saver
     
+    async def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints for a thread on any backend."""
+        await self.memory_saver.adelete_thread(thread_id)
+        self.logger.info(f"Cleared memory for thread: {thread_id}")
+    
     def clear_memory(self, thread_id: Optional[str] = None) -> None:
-        """Clear conversation memory."""
-        if thread_id and hasattr(self.memory_saver, 'storage'):
-            if thread_id in self.memory_saver.storage:
-                del self.memory_saver.storage[thread_id]
+        """Clear conversation memory for one thread, or for all threads."""
+        if not isinstance(self.memory_saver, BoundedMemorySaver):
+            self.logger.warning("clear_memory is only supported for in-process memory; use delete_thread")
+            return
+        
+        if thread_id:
+            if self.memory_saver.has_thread(thread_id):
                 self.logger.info(f"Cleared memory for thread: {thread_id}")
             else:
-                self.logger.debug(f"No memory found for thread: {thread_id}")
+                self.logger.debug(f"No resident memory found for thread: {thread_id}")
+            self.memory_saver.delete_thread(thread_id)
         else:
-            self.memory_saver = MemorySaver()
+            # Clear in place: compiled graphs hold a reference to this saver
+            self.memory_saver.clear()
             self.logger.info("Cleared all memory")
     
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Get residency, eviction and rehydration counters for the checkpointer."""
+        if isinstance(self.memory_saver, BoundedMemorySaver):
+            return {"backend": self.backend, **self.memory_saver.stats()}
+        return {"backend": self.backend}
+    
     def get_conversation_history(self, thread_id: str) -> Optional[dict]:
         """Get conversation history for a thread."""
         try:
@@ -3,12 +3,13 @@ Prompt template service for rendering Jinja2 templates for prompts and instructi
 Handles system prompt generation, instruction loading, and guardrail management.
 """
 import json
-from typing import Optional, Dict
+from typing import Any, Dict, List, Optional
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
 import threading
 
 from app.models.construct import Construct
+from app.services.construct_cache_service import construct_cache_service
 
 
 class PromptTemplateService:
@@ -103,6 +104,7 @@ class PromptTemplateService:
         construct: Optional[Construct] = None,
         construct_id: Optional[str] = None,
         custom_instructions: Optional[str] = None,
+        relationships: Optional[List[Dict[str, Any]]] = None,
         **kwargs
     ) -> str:
         """
@@ -113,6 +115,7 @@ class PromptTemplateService:
             construct: The construct object if available
             construct_id: The construct ID if construct is not available
             custom_instructions: Additional custom instructions
+            relationships: Linked constructs and fragments to include
             **kwargs: Additional template variables
         
         Returns:
@@ -125,10 +128,17 @@ class PromptTemplateService:
             "construct": construct,
             "construct_id": construct_id,
             "custom_instructions": custom_instructions,
+            "relationships": relationships,
             **kwargs
         }
         
-        return template.render(**context)
+        # Extra variables (e.g. server time) vary per call, so only plain prompts are cached
+        if kwargs:
+            return template.render(**context)
+        return construct_cache_service.get_or_render_prompt(
+            construct, construct_id, mode, custom_instructions, relationships,
+            lambda: template.render(**context)
+        )
     
     def render_template(self, template_name: str, **context) -> str:
         """
@@ -0,0 +1,103 @@
+"""
+Relationship graph service.
+Builds a construct's neighborhood from the link graph with a single recursive
+query, caching the traversal per user until one of their links changes.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.config import settings
+from app.crud.construct_link import get_fragments_for_links, get_neighborhood_links
+from app.utils.cache_utils import LRUCache
+
+
+class RelationshipGraphService:
+    """Traverses construct links with a per-user adjacency cache."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 300):
+        self.logger = logging.getLogger(__name__)
+        # (user_id, root_id, depth) -> link rows from get_neighborhood_links
+        self._adjacency = LRUCache(maxsize=max_entries, ttl=ttl_seconds)
+
+    async def get_neighborhood_links(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        root_id: UUID,
+        depth: int
+    ) -> List[Dict[str, Any]]:
+        """Links within depth hops of root_id, from cache when possible."""
+        key = (user_id, root_id, depth)
+        links = self._adjacency.get(key)
+        if links is None:
+            links = await get_neighborhood_links(db, user_id, root_id, depth)
+            self._adjacency.set(key, links)
+        return links
+
+    async def get_neighborhood(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        root_id: UUID,
+        root_name: str,
+        depth: int,
+        context_tag: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the neighborhood graph of a construct.
+
+        Returns nodes (with their hop distance), links, and each link's
+        fragments filtered by context_tag, using at most two queries.
+        """
+        links = await self.get_neighborhood_links(db, user_id, root_id, depth)
+        fragments = await get_fragments_for_links(
+            db, [link["id"] for link in links], context_tag
+        )
+
+        fragments_by_link: Dict[UUID, List[Any]] = {}
+        for fragment in fragments:
+            fragments_by_link.setdefault(fragment.construct_link_id, []).append(fragment)
+
+        nodes: Dict[UUID, Dict[str, Any]] = {root_id: {"id": root_id, "name": root_name, "depth": 0}}
+        for link in links:
+            for side in ("source", "target"):
+                node_id = link[f"{side}_id"]
+                if node_id not in nodes:
+                    nodes[node_id] = {
+                        "id": node_id,
+                        "name": link[f"{side}_name"],
+                        "depth": link[f"{side}_depth"]
+                    }
+
+        return {
+            "root_id": root_id,
+            "depth": depth,
+            "nodes": sorted(nodes.values(), key=lambda node: node["depth"]),
+            "links": [
+                {**link, "fragments": fragments_by_link.get(link["id"], [])}
+                for link in links
+            ]
+        }
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached traversal of a user's link graph."""
+        dropped = self._adjacency.invalidate_where(lambda key: key[0] == user_id)
+        self.logger.debug(f"Invalidated {dropped} cached neighborhoods for user {user_id}")
+
+    def clear(self) -> None:
+        """Drop every cached traversal."""
+        self._adjacency.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Adjacency cache statistics."""
+        return self._adjacency.stats()
+
+
+# Global relationship graph service
+relationship_graph_service = RelationshipGraphService(
+    max_entries=settings.relationship_graph_cache_size,
+    ttl_seconds=settings.construct_cache_ttl_seconds
+)
@@ -0,0 +1,190 @@
+"""
+Rolling conversation summary service.
+Folds conversation turns that no longer fit the context budget into a running
+summary stored in the thread's checkpoint state, off the request path.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from app.config.config import settings
+from app.services.llm_config_service import llm_config_service
+from app.utils.token_utils import count_message_tokens, count_messages_tokens
+
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+Summarizer = Callable[[List[BaseMessage], Optional[str]], Awaitable[str]]
+
+
+def messages_after_watermark(
+    messages: List[BaseMessage],
+    watermark_id: Optional[str]
+) -> List[BaseMessage]:
+    """
+    Get the conversation messages not yet folded into the summary.
+    
+    System messages are always kept; other messages up to and including the
+    watermark message are covered by the rolling summary.
+    """
+    if not watermark_id:
+        return list(messages)
+    
+    watermark_index = next(
+        (index for index, message in enumerate(messages) if message.id == watermark_id),
+        None
+    )
+    if watermark_index is None:
+        return list(messages)
+    
+    return [
+        message for index, message in enumerate(messages)
+        if index > watermark_index or isinstance(message, SystemMessage)
+    ]
+
+
+def build_summary_message(summary: Optional[str]) -> Optional[SystemMessage]:
+    """Wrap a rolling summary as a system message for the prompt."""
+    if not summary:
+        return None
+    return SystemMessage(content=f"{SUMMARY_PREFIX}{summary}")
+
+
+class RollingSummaryService:
+    """Schedules background summarization of turns that overflow the context budget."""
+    
+    # Start folding once the prompt uses this share of the budget...
+    TRIGGER_RATIO = 0.75
+    # ...and fold until the unsummarized history fits in this share
+    TARGET_RATIO = 0.5
+    
+    def __init__(self, enabled: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+    
+    def schedule(
+        self,
+        graph,
+        config: Dict[str, Any],
+        request_data: Dict[str, Any],
+        summarizer: Summarizer
+    ) -> None:
+        """Start a background summarization task for a thread, if none is running."""
+        thread_id = config["configurable"]["thread_id"]
+        if not self.enabled or thread_id in self._in_flight:
+            return
+        
+        self._in_flight.add(thread_id)
+        task = asyncio.create_task(
+            self._summarize_thread(graph, config, request_data, summarizer)
+        )
+        self._tasks.add(task)
+        
+        def _on_done(done: asyncio.Task) -> None:
+            self._tasks.discard(done)
+            self._in_flight.discard(thread_id)
+        
+        task.add_done_callback(_on_done)
+    
+    def select_messages_to_fold(
+        self,
+        values: Dict[str, Any],
+        budget: int
+    ) -> List[BaseMessage]:
+        """
+        Pick the oldest unsummarized turns to fold, if the history is over budget.
+        
+        Args:
+            values: Thread checkpoint values (ChatState)
+            budget: Prompt token budget for the thread's model
+        
+        Returns:
+            Messages to fold into the summary, oldest first (possibly empty)
+        """
+        pending = messages_after_watermark(
+            values.get("messages", []),
+            values.get("summary_watermark_id")
+        )
+        system_messages = [m for m in pending if isinstance(m, SystemMessage)][:1]
+        summary_message = build_summary_message(values.get("conversation_summary"))
+        if summary_message:
+            system_messages.append(summary_message)
+        history = [m for m in pending if not isinstance(m, SystemMessage)]
+        
+        fixed_tokens = count_messages_tokens(system_messages)
+        if fixed_tokens + count_messages_tokens(history) <= budget * self.TRIGGER_RATIO:
+            return []
+        
+        # Keep the most recent turns that fit the target, fold the rest
+        remaining = budget * self.TARGET_RATIO - fixed_tokens
+        keep_start = len(history)
+        for index in range(len(history) - 1, -1, -1):
+            remaining -= count_message_tokens(history[index])
+            if remaining < 0:
+                break
+            keep_start = index
+        
+        # Fold whole turns: the kept window starts on a user message
+        while keep_start < len(history) and not isinstance(history[keep_start], HumanMessage):
+            keep_start += 1
+        
+        return history[:keep_start]
+    
+    async def _summarize_thread(
+        self,
+        graph,
+        config: Dict[str, Any],
+        request_data: Dict[str, Any],
+        summarizer: Summarizer
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        try:
+            snapshot = await graph.aget_state(config)
+            values = snapshot.values if snapshot else {}
+            if not values.get("messages"):
+                return
+            
+            budget = llm_config_service.get_context_budget(
+                request_data["model"],
+                request_data.get("max_tokens")
+            )
+            to_fold = self.select_messages_to_fold(values, budget)
+            if not to_fold:
+                return
+            
+            summary = await summarizer(to_fold, values.get("conversation_summary"))
+            
+            await graph.aupdate_state(
+                config,
+                {
+                    "conversation_summary": summary,
+                    "summary_watermark_id": to_fold[-1].id
+                },
+                as_node="response_formatting"
+            )
+            self.completed += 1
+            self.logger.info(f"Folded {len(to_fold)} messages into rolling summary for thread {thread_id}")
+            
+        except Exception as e:
+            self.failed += 1
+            self.logger.error(f"Rolling summary failed for thread {thread_id}: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return background task counters."""
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._in_flight),
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+
+# Global instance
+rolling_summary_service = RollingSummaryService(enabled=settings.rolling_summary_enabled)
@@ -11,6 +11,7 @@ from langgraph.graph.message import add_messages
 
 from app.services.memory_service import memory_service
 from app.services.llm_config_service import LLMConfig
+from app.utils.token_utils import trim_messages_to_budget
 
 class SimpleState(TypedDict):
     """State definition for the simple chat graph."""
@@ -76,17 +77,19 @@ class StateGraphService:
         except Exception as e:
             return False, f"Graph validation failed: {str(e)}"
     
-    def create_message_trimmer(self, max_messages: int = 20, preserve_system: bool = True):
-        """Create a message trimmer function for context window management."""
+    def create_message_trimmer(self, max_tokens: int = 8192, preserve_system: bool = True):
+        """
+        Create a token-budgeted message trimmer for context window management.
+        
+        The system prompt and the latest user turn are always kept; older
+        history is dropped oldest-first until the messages fit max_tokens.
+        """
         def trim_messages(messages: List[BaseMessage]) -> List[BaseMessage]:
-            if len(messages) <= max_messages:
-                return messages
-            
-            # Preserve system message if requested
-            if preserve_system and messages and messages[0].type == "system":
-                return [messages[0]] + messages[-(max_messages-1):]
-            
-            return messages[-max_messages:]
+            return trim_messages_to_budget(
+                messages,
+                max_tokens=max_tokens,
+                preserve_system=preserve_system
+            )
         
         return trim_messages
     
@@ -103,6 +106,7 @@ class StateGraphService:
         from app.services.chat_nodes import (
             ContextPreparationNode,
             SystemPromptInjectionNode,
+            ContextTrimmingNode,
             LLMProcessingNode,
             ResponseFormattingNode
         )
@@ -110,6 +114,7 @@ class StateGraphService:
         # Initialize node instances
         context_node = ContextPreparationNode()
         system_prompt_node = SystemPromptInjectionNode()
+        trimming_node = ContextTrimmingNode()
         llm_node = LLMProcessingNode()
         response_node = ResponseFormattingNode()
         
@@ -119,13 +124,15 @@ class StateGraphService:
         # Add nodes using dedicated node classes
         graph_builder.add_node("context_preparation", context_node.process)
         graph_builder.add_node("system_prompt_injection", system_prompt_node.process)
+        graph_builder.add_node("context_trimming", trimming_node.process)
         graph_builder.add_node("llm_processing", llm_node.process)
         graph_builder.add_node("response_formatting", response_node.process)
         
         # Add edges for the chat pipeline
         graph_builder.add_edge(START, "context_preparation")
         graph_builder.add_edge("context_preparation", "system_prompt_injection")
-        graph_builder.add_edge("system_prompt_injection", "llm_processing")
+        graph_builder.add_edge("system_prompt_injection", "context_trimming")
+        graph_builder.add_edge("context_trimming", "llm_processing")
         graph_builder.add_edge("llm_processing", "response_formatting")
         graph_builder.add_edge("response_formatting", END)
         
@@ -0,0 +1,130 @@
+"""
+Token verification service.
+Verifies Supabase access tokens and caches the verified claims by token hash
+until the token's exp, so a session's requests pay for one signature check.
+HS256 tokens are checked against the project JWT secret; asymmetric tokens
+(RS256/ES256) against the project's JWKS, fetched and cached by key id.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from decouple import config
+from jose import jwt, JWTError
+
+from app.config.config import settings
+from app.utils.cache_utils import LRUCache
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+TOKEN_AUDIENCE = "authenticated"
+
+
+class TokenVerificationService:
+    """Verifies JWTs and caches their claims until expiry."""
+
+    def __init__(
+        self,
+        secret: str,
+        algorithm: str,
+        jwks_url: Optional[str] = None,
+        cache_size: int = 4096,
+        max_cache_ttl: float = 3600,
+        jwks_ttl: float = 600,
+        jwks_min_refresh_interval: float = 30
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.secret = secret
+        self.algorithm = algorithm
+        self.jwks_url = jwks_url
+        self.max_cache_ttl = max_cache_ttl
+        self.jwks_ttl = jwks_ttl
+        self.jwks_min_refresh_interval = jwks_min_refresh_interval
+        self._claims = LRUCache(maxsize=cache_size)
+        self._jwks: Dict[str, Dict[str, Any]] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Return the verified claims of a token.
+
+        Raises:
+            JWTError: If the token is malformed, expired or fails verification
+        """
+        token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = self._claims.get(token_hash)
+        if claims is not None:
+            return claims
+
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm in ASYMMETRIC_ALGORITHMS and self.jwks_url:
+            key = await self._get_signing_key(header.get("kid"))
+        elif algorithm == self.algorithm:
+            key = self.secret
+        else:
+            raise JWTError(f"Unsupported token algorithm: {algorithm}")
+
+        claims = jwt.decode(token, key, algorithms=[algorithm], audience=TOKEN_AUDIENCE)
+
+        ttl = self.max_cache_ttl
+        if "exp" in claims:
+            ttl = min(ttl, float(claims["exp"]) - time.time())
+        if ttl > 0:
+            self._claims.set(token_hash, claims, ttl=ttl)
+        self.logger.debug(
+            f"Verified token hash={token_hash[:12]} sub={claims.get('sub')} alg={algorithm} ttl={ttl:.0f}s"
+        )
+        return claims
+
+    async def _get_signing_key(self, kid: Optional[str]) -> Dict[str, Any]:
+        """Return the JWKS key for kid, refetching the key set if it is stale or kid is unknown."""
+        stale = time.monotonic() - self._jwks_fetched_at > self.jwks_ttl
+        if stale or kid not in self._jwks:
+            async with self._jwks_lock:
+                since_fetch = time.monotonic() - self._jwks_fetched_at
+                if since_fetch > self.jwks_ttl or (
+                    kid not in self._jwks and since_fetch > self.jwks_min_refresh_interval
+                ):
+                    await self._fetch_jwks()
+
+        key = self._jwks.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return key
+
+    async def _fetch_jwks(self) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+            self._jwks = {key.get("kid"): key for key in response.json().get("keys", [])}
+            self.logger.info(f"Loaded {len(self._jwks)} signing keys from JWKS")
+        except (httpx.HTTPError, ValueError) as e:
+            # Keep serving the previous key set; retry after the refresh interval
+            self.logger.warning(f"Failed to fetch JWKS: {e}")
+        self._jwks_fetched_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Drop all cached claims and signing keys."""
+        self._claims.clear()
+        self._jwks = {}
+        self._jwks_fetched_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Claims cache statistics and the number of cached signing keys."""
+        return {"claims": self._claims.stats(), "jwks_keys": len(self._jwks)}
+
+
+# Global token verifier
+token_verification_service = TokenVerificationService(
+    secret=config('SUPABASE_JWT_SECRET'),
+    algorithm=config('JWT_ALGORITHM'),
+    jwks_url=settings.supabase_jwks_url,
+    cache_size=settings.jwt_claims_cache_size,
+    max_cache_ttl=settings.jwt_claims_cache_max_ttl_seconds,
+    jwks_ttl=settings.jwks_cache_ttl_seconds
+)
@@ -0,0 +1,23 @@
+"""
+HTTP entity tag helpers.
+ETags are weak validators derived from row versions (updated_at), so a
+conditional request can be answered without loading or serializing the rows.
+"""
+import hashlib
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the given version parts."""
+    raw = "|".join(str(part) for part in parts).encode("utf-8")
+    return f'W/"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
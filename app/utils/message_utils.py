@@ -2,13 +2,14 @@
 Message utility functions for formatting and converting chat messages between different formats.
 """
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, BaseMessage
 import uuid
 
 from app.schemas.chat_models import AgentChatRequest, ChatMessage
 from app.crud.construct import get_construct_by_id
+from app.models.construct import Construct
 from ..services.prompt_template_service import prompt_template_service
 
 
@@ -46,6 +47,8 @@ async def convert_chat_messages_to_langchain(
     db: AsyncSession,
     construct_id: uuid.UUID,
     mode: str = "chat",
+    construct: Optional[Union[Construct, Dict[str, Any]]] = None,
+    relationships: Optional[List[Dict[str, Any]]] = None,
 ) -> tuple[List[BaseMessage], Optional[str]]:
     """
     Convert chat messages to langchain format.
@@ -57,15 +60,17 @@ async def convert_chat_messages_to_langchain(
         db: Database session
         construct_id: ID of the construct
         mode: Chat mode (default: "chat")
+        construct: Construct (or its dict snapshot) already loaded for this request; fetched by ID if omitted
+        relationships: Linked constructs to include in the system prompt
         
     Returns:
         Tuple of (langchain_messages, system_prompt)    """
     langchain_messages = []
-    construct = None
-    try:
-        construct = await get_construct_by_id(db, construct_id)
-    except Exception as e:
-        logger.error(f"Error fetching construct {construct_id}: {e}")
+    if construct is None:
+        try:
+            construct = await get_construct_by_id(db, construct_id)
+        except Exception as e:
+            logger.error(f"Error fetching construct {construct_id}: {e}")
     
     system_prompt = None
     try:
@@ -79,7 +84,8 @@ async def convert_chat_messages_to_langchain(
             mode=mode,
             construct=construct,
             construct_id=str(construct_id),
-            custom_instructions=custom_instructions
+            custom_instructions=custom_instructions,
+            relationships=relationships
         )
     except Exception as e:
         logger.error(f"Error generating system prompt: {e}")
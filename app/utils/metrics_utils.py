@@ -0,0 +1,80 @@
+"""
+In-process metrics utilities.
+Provides a thread-safe fixed-bucket histogram with quantile estimates.
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+
+# Latency buckets in seconds, from 0.5 ms to 10 s
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Histogram:
+    """Thread-safe histogram of observations over fixed upper-bound buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Sorted bucket upper bounds; larger observations fall into an overflow bucket
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return self.buckets[index] if index < len(self.buckets) else self.max
+            return self.max
+
+    def reset(self) -> None:
+        """Drop all observations."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cumulative bucket counts (keyed by upper bound), totals and quantile estimates."""
+        with self._lock:
+            cumulative = {}
+            running = 0
+            for bound, bucket_count in zip([*self.buckets, "+Inf"], self._counts):
+                running += bucket_count
+                cumulative[str(bound)] = running
+            count, total, largest = self.count, self.sum, self.max
+
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "max": round(largest, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative
+        }
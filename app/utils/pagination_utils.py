@@ -0,0 +1,33 @@
+"""
+Keyset pagination helpers.
+Cursors are opaque URL-safe tokens wrapping the (created_at, id) of the last
+row on a page.
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+# Page size when a client pages with a cursor but no explicit limit
+DEFAULT_PAGE_SIZE = 50
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode the sort key of the last row on a page."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -4,59 +4,144 @@ Pure utility functions for creating streaming HTTP responses.
 """
 
 import json
-import asyncio
 import logging
-from typing import Dict, Any
-from fastapi.responses import StreamingResponse, JSONResponse
+import uuid as uuid_lib
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, Callable, Optional
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from langchain_core.messages import AIMessageChunk
 
 
 logger = logging.getLogger(__name__)
 
+# Graph node whose LLM tokens are forwarded to the client
+STREAMING_NODE = "llm_processing"
 
-async def create_streaming_response(result: Dict[str, Any]):
-    """Create a proper streaming response with token-by-token delivery."""
-    response_content = result.get("response_content", {})
+
+async def create_streaming_response(
+    graph,
+    initial_state: Dict[str, Any],
+    config: Dict[str, Any],
+    model: str,
+    on_complete: Optional[Callable[[], None]] = None,
+    on_close: Optional[Callable[[], None]] = None
+) -> StreamingResponse:
+    """
+    Create a streaming response that forwards LLM tokens as the graph produces them.
+    
+    The graph runs to completion inside the stream, so the final assistant
+    message is still checkpointed once the last token has been sent.
     
-    if isinstance(response_content, dict) and "choices" in response_content:
-        content = response_content["choices"][0]["message"]["content"]
-        base_response = response_content.copy()
+    Args:
+        graph: Compiled chat graph
+        initial_state: Initial state for graph processing
+        config: Graph configuration (thread_id)
+        model: Model name reported in each chunk
+        on_complete: Optional callback run after the graph finished successfully
+        on_close: Optional idempotent callback run when the stream ends in any way,
+            including client disconnects (e.g. releasing an admission slot)
         
-        async def generate():
-            words = content.split()
-            
-            for i, word in enumerate(words):
-                word_with_space = word + (" " if i < len(words) - 1 else "")
+    Returns:
+        StreamingResponse emitting OpenAI-compatible SSE chunks
+    """
+    base_response = {
+        "id": f"chatcmpl-{uuid_lib.uuid4()}",
+        "created": int(datetime.now().timestamp()),
+        "model": model
+    }
+    
+    stream = generate_graph_stream(graph, initial_state, config, base_response, on_complete)
+    if on_close:
+        stream = _close_after(stream, on_close)
+    
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        },
+        # Also runs if the client disconnects before the stream was started
+        background=BackgroundTask(on_close) if on_close else None
+    )
+
+
+async def _close_after(stream: AsyncIterator[str], on_close: Callable[[], None]) -> AsyncIterator[str]:
+    """Yield from stream, then run on_close however the stream ends."""
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        on_close()
+
+
+async def generate_graph_stream(
+    graph,
+    initial_state: Dict[str, Any],
+    config: Dict[str, Any],
+    base_response: Dict[str, Any],
+    on_complete: Optional[Callable[[], None]] = None
+) -> AsyncIterator[str]:
+    """Run the graph and yield SSE chunks for every LLM token."""
+    is_first = True
+    
+    try:
+        async for stream_mode, payload in graph.astream(
+            initial_state,
+            config=config,
+            stream_mode=["messages", "updates"]
+        ):
+            if stream_mode == "messages":
+                message_chunk, metadata = payload
+                if metadata.get("langgraph_node") != STREAMING_NODE:
+                    continue
+                if not isinstance(message_chunk, AIMessageChunk) or not message_chunk.content:
+                    continue
+                
                 chunk = create_streaming_chunk(
                     base_response=base_response,
-                    word=word_with_space,
-                    is_first=(i == 0),
+                    word=message_chunk.content,
+                    is_first=is_first,
                     is_final=False
                 )
-                
+                is_first = False
                 yield format_sse_data(chunk)
-                await asyncio.sleep(0.05)
             
-            # Send final completion chunk
-            final_chunk = create_streaming_chunk(
-                base_response=base_response,
-                word="",
-                is_first=False,
-                is_final=True
-            )
-            
-            yield format_sse_data(final_chunk)
-            yield "data: [DONE]\n\n"
-        
-        return StreamingResponse(
-            generate(),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive"
-            }
-        )
+            elif stream_mode == "updates":
+                error = _extract_error(payload)
+                if error:
+                    logger.error(f"Chat graph failed during streaming: {error}")
+                    yield format_sse_data({"error": error})
+                    yield "data: [DONE]\n\n"
+                    return
     
-    return JSONResponse(content=response_content)
+    except Exception as e:
+        logger.error(f"Error streaming chat response: {e}")
+        yield format_sse_data({"error": str(e)})
+        yield "data: [DONE]\n\n"
+        return
+    
+    final_chunk = create_streaming_chunk(
+        base_response=base_response,
+        word="",
+        is_first=False,
+        is_final=True
+    )
+    
+    yield format_sse_data(final_chunk)
+    yield "data: [DONE]\n\n"
+    
+    if on_complete:
+        on_complete()
+
+
+def _extract_error(updates: Dict[str, Any]) -> Any:
+    """Return the first error reported by a node update, if any."""
+    for node_update in (updates or {}).values():
+        if isinstance(node_update, dict) and node_update.get("error"):
+            return node_update["error"]
+    return None
 
 
 def create_streaming_chunk(base_response: Dict[str, Any], word: str, is_first: bool = False, is_final: bool = False) -> Dict[str, Any]:
@@ -0,0 +1,171 @@
+"""
+Token counting utilities for context window management.
+Counts tokens with tiktoken and caches per-message counts so history
+messages are never re-tokenized on later turns.
+"""
+
+import hashlib
+import logging
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from app.utils.cache_utils import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+# Encoding used as an approximation for local (non-OpenAI) models
+DEFAULT_ENCODING = "cl100k_base"
+
+# Per-message framing overhead (role markers, separators)
+MESSAGE_TOKEN_OVERHEAD = 4
+
+_message_token_cache = LRUCache(maxsize=50_000)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None if it cannot be loaded (e.g. offline)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, using character estimate: {e}")
+        return None
+
+
+def count_text_tokens(text: str) -> int:
+    """Count tokens in a string."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+def _message_cache_key(message: BaseMessage, text: str) -> Tuple[str, str]:
+    if message.id:
+        return (message.id, str(len(text)))
+    return ("sha1", hashlib.sha1(text.encode("utf-8")).hexdigest())
+
+
+def count_message_tokens(message: BaseMessage) -> int:
+    """Count tokens for a message, using the per-message cache."""
+    text = _message_text(message)
+    key = _message_cache_key(message, text)
+    
+    cached = _message_token_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    count = count_text_tokens(text) + MESSAGE_TOKEN_OVERHEAD
+    _message_token_cache.set(key, count)
+    return count
+
+
+def count_messages_tokens(messages: List[BaseMessage]) -> int:
+    """Count tokens for a list of messages."""
+    return sum(count_message_tokens(message) for message in messages)
+
+
+def trim_messages_to_budget(
+    messages: List[BaseMessage],
+    max_tokens: int,
+    preserve_system: bool = True
+) -> List[BaseMessage]:
+    """
+    Fit messages into a token budget, keeping the most recent history.
+    
+    The first system message and the latest user turn are always kept, even
+    if they alone exceed the budget. Older history is dropped from the front
+    so the kept window stays contiguous and starts on a user turn.
+    
+    Args:
+        messages: Full conversation, in any system/history order
+        max_tokens: Token budget for the prompt (excluding reply reservation)
+        preserve_system: Whether to always keep the first system message
+    
+    Returns:
+        Trimmed messages with the system message first
+    """
+    system_message: Optional[BaseMessage] = None
+    history: List[BaseMessage] = []
+    for message in messages:
+        if isinstance(message, SystemMessage):
+            if system_message is None and preserve_system:
+                system_message = message
+            continue
+        history.append(message)
+    
+    latest_turn_start = len(history)
+    for index in range(len(history) - 1, -1, -1):
+        if isinstance(history[index], HumanMessage):
+            latest_turn_start = index
+            break
+    latest_turn = history[latest_turn_start:]
+    older = history[:latest_turn_start]
+    
+    head = [system_message] if system_message else []
+    remaining = max_tokens - count_messages_tokens(head) - count_messages_tokens(latest_turn)
+    
+    kept_start = len(older)
+    for index in range(len(older) - 1, -1, -1):
+        tokens = count_message_tokens(older[index])
+        if tokens > remaining:
+            break
+        remaining -= tokens
+        kept_start = index
+    
+    # Start the window on a user turn rather than an orphaned reply
+    while kept_start < len(older) and not isinstance(older[kept_start], HumanMessage):
+        kept_start += 1
+    
+    return head + older[kept_start:] + latest_turn
+
+
+def chunk_texts_by_tokens(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Group consecutive texts into chunks of at most max_tokens each.
+    
+    A single text larger than max_tokens becomes its own chunk.
+    
+    Args:
+        texts: Texts in order (e.g. formatted conversation lines)
+        max_tokens: Token limit per chunk
+    
+    Returns:
+        List of chunks, each a list of texts in original order
+    """
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    
+    for text in texts:
+        tokens = count_text_tokens(text)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def get_token_cache_stats() -> dict:
+    """Return per-message token cache counters."""
+    return _message_token_cache.stats()